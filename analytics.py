@@ -0,0 +1,148 @@
+"""Attendance analytics over the draft history.
+
+Each meeting (date and time) is one column; when several drafts were saved for
+the same meeting only the most recently updated one counts. A student is *eligible* for a meeting
+when their (YEAR, DEPARTMENT) was among the meeting's selection, so percentages
+only count meetings a student was expected at. Parsed drafts are cached by
+(id, version), so a refresh only reads drafts that are new or changed.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+import draft_store
+
+DEFAULTER_THRESHOLD = 75.0
+MIN_MEETINGS = 3
+
+
+def _as_list(value):
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+class MeetingColumn:
+    __slots__ = ("draft_id", "date", "time", "years", "departments", "names")
+
+    def __init__(self, draft_id, data):
+        self.draft_id = draft_id
+        self.date = str(data.get("date", ""))
+        self.time = str(data.get("time", "")).strip()
+        self.years = [int(y) for y in _as_list(data.get("year"))]
+        self.departments = [str(d) for d in _as_list(data.get("department"))]
+        self.names = list(data.get("attendance", []))
+
+
+class AttendanceAnalytics:
+    def __init__(self, db_path=draft_store.DB_PATH):
+        self.db_path = db_path
+        self._columns = {}   # draft id -> (version, MeetingColumn)
+        self._report = None  # (cache key, report)
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """Loads new or changed drafts; returns one column per meeting in date order."""
+        conn = draft_store.connect(self.db_path)
+        current = {r[0]: (r[1], r[2]) for r in conn.execute("SELECT id, version, updated_at FROM drafts")}
+        with self._lock:
+            for draft_id in list(self._columns):
+                if draft_id not in current:
+                    del self._columns[draft_id]
+            for draft_id, (version, _) in current.items():
+                cached = self._columns.get(draft_id)
+                if cached is not None and cached[0] == version:
+                    continue
+                data = draft_store.load(draft_id, self.db_path)
+                if data is not None:
+                    self._columns[draft_id] = (version, MeetingColumn(draft_id, data))
+            # Extra drafts of one meeting (re-saves, "Start New Draft") must not
+            # count as extra meetings: keep the latest-updated draft per (date, time).
+            latest = {}
+            for draft_id, (_, col) in self._columns.items():
+                key = (col.date, col.time)
+                seen = latest.get(key)
+                if seen is None or (current[draft_id][1], draft_id) > (current[seen.draft_id][1], seen.draft_id):
+                    latest[key] = col
+            columns = list(latest.values())
+        columns.sort(key=lambda c: (c.date, c.time, c.draft_id))
+        return columns
+
+    def matrices(self, snapshot, columns):
+        """(attended, eligible) bool matrices of shape (students, meetings)."""
+        df = snapshot.df
+        n, m = len(df), len(columns)
+        attended = np.zeros((n, m), dtype=bool)
+        eligible = np.zeros((n, m), dtype=bool)
+        row_of = snapshot.index.row_of
+        years = df["YEAR"].to_numpy() if "YEAR" in df.columns else np.zeros(n)
+        depts = df["DEPARTMENT"].astype(str).to_numpy() if "DEPARTMENT" in df.columns else np.full(n, "")
+        for j, col in enumerate(columns):
+            rows = [row_of[name] for name in col.names if name in row_of]
+            attended[rows, j] = True
+            eligible[:, j] = np.isin(years, col.years) & np.isin(depts, col.departments)
+        # Someone who attended counts as expected even if the selection didn't cover them.
+        eligible |= attended
+        return attended, eligible
+
+    @staticmethod
+    def streaks(attended, eligible):
+        """(current, longest) runs of attended meetings, skipping meetings a student wasn't expected at."""
+        n = attended.shape[0]
+        run = np.zeros(n, dtype=np.int32)
+        longest = np.zeros(n, dtype=np.int32)
+        for j in range(attended.shape[1]):
+            att, elig = attended[:, j], eligible[:, j]
+            run = np.where(elig, np.where(att, run + 1, 0), run)
+            np.maximum(longest, run, out=longest)
+        return run, longest
+
+    def report(self, snapshot, threshold=DEFAULTER_THRESHOLD, min_meetings=MIN_MEETINGS):
+        """Per-student, per-department and per-year summaries plus the defaulter list."""
+        columns = self.refresh()
+        key = (snapshot.version, tuple((c.draft_id, self._columns[c.draft_id][0]) for c in columns), threshold, min_meetings)
+        with self._lock:
+            if self._report is not None and self._report[0] == key:
+                return self._report[1]
+
+        attended, eligible = self.matrices(snapshot, columns)
+        n_att = attended.sum(axis=1)
+        n_elig = eligible.sum(axis=1)
+        current, longest = self.streaks(attended, eligible)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            pct = np.where(n_elig > 0, 100.0 * n_att / n_elig, np.nan)
+
+        df = snapshot.df
+        students = pd.DataFrame({
+            "NAME": snapshot.index.names,
+            "YEAR": df["YEAR"].to_numpy() if "YEAR" in df.columns else None,
+            "DEPARTMENT": df["DEPARTMENT"].to_numpy() if "DEPARTMENT" in df.columns else None,
+            "Attended": n_att,
+            "Eligible": n_elig,
+            "Attendance %": np.round(pct, 1),
+            "Current Streak": current,
+            "Longest Streak": longest,
+        })
+
+        def rates(by):
+            g = students[students["Eligible"] > 0].groupby(by)[["Attended", "Eligible"]].sum()
+            g["Participation %"] = (100.0 * g["Attended"] / g["Eligible"]).round(1)
+            return g.sort_values("Participation %", ascending=False)
+
+        defaulters = students[(students["Eligible"] >= min_meetings) & (students["Attendance %"] < threshold)]
+        result = {
+            "meetings": pd.DataFrame({
+                "Date": [c.date for c in columns],
+                "Time": [c.time for c in columns],
+                "Present": attended.sum(axis=0),
+                "Expected": eligible.sum(axis=0),
+            }),
+            "students": students,
+            "departments": rates("DEPARTMENT") if "DEPARTMENT" in df.columns else pd.DataFrame(),
+            "years": rates("YEAR") if "YEAR" in df.columns else pd.DataFrame(),
+            "defaulters": defaulters.sort_values("Attendance %"),
+        }
+        with self._lock:
+            self._report = (key, result)
+        return result
@@ -0,0 +1,58 @@
+"""Attendance held as a sorted array of roster row ids (one snapshot's rows)."""
+import numpy as np
+
+_EMPTY = np.empty(0, dtype=np.int32)
+
+
+class AttendanceSet:
+    """The present rows of one roster snapshot; drafts still store attendance as names.
+
+    Only the ticked rows are kept, so a session's attendance costs 4 bytes per
+    present student however large the shared roster is.
+    """
+
+    def __init__(self, snapshot, rows=None):
+        self.snapshot = snapshot
+        self.rows = rows if rows is not None else _EMPTY
+
+    @property
+    def version(self):
+        return self.snapshot.version
+
+    @classmethod
+    def from_names(cls, snapshot, names):
+        """Names that are no longer on the roster are dropped, as before."""
+        row_of = snapshot.index.row_of
+        rows = [row_of[n] for n in names if n in row_of]
+        return cls(snapshot, np.unique(np.array(rows, dtype=np.int32)))
+
+    def to_names(self, rows=None):
+        """Present names, in ``rows`` order when given, else roster order."""
+        if rows is None:
+            rows = self.rows
+        else:
+            rows = rows[self.mask(rows)]
+        return self.snapshot.index.names[rows].tolist()
+
+    def rebase(self, snapshot):
+        """Carries the ticks over to a newer roster snapshot by name."""
+        if snapshot.version == self.version:
+            return self
+        return AttendanceSet.from_names(snapshot, self.to_names())
+
+    def mask(self, rows):
+        rows = np.asarray(rows)
+        if not len(self.rows):
+            return np.zeros(rows.shape, dtype=bool)
+        pos = np.minimum(np.searchsorted(self.rows, rows), len(self.rows) - 1)
+        return self.rows[pos] == rows
+
+    def set(self, rows, value=True):
+        rows = np.atleast_1d(np.asarray(rows, dtype=np.int32))
+        if value:
+            self.rows = np.union1d(self.rows, rows).astype(np.int32)
+        else:
+            self.rows = np.setdiff1d(self.rows, rows).astype(np.int32)
+
+    def count(self, rows=None):
+        return int(len(self.rows) if rows is None else self.mask(rows).sum())
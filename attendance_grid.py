@@ -0,0 +1,201 @@
+"""Paginated, data_editor-backed attendance grid (one widget per year section)."""
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import attendance_import
+import profiling
+import ui_helpers
+from attendance import AttendanceSet
+
+PAGE_SIZE = 50
+
+
+def bump_generation():
+    """Forces every grid to re-key so it redraws from the attendance state."""
+    st.session_state.grid_gen = st.session_state.get("grid_gen", 0) + 1
+
+
+def set_attendance(names):
+    """Queues a draft's name list; it is resolved against the roster on the next render."""
+    st.session_state.pending_attendance = list(names)
+    bump_generation()
+
+
+def current(snapshot):
+    """The session's AttendanceSet, rebased onto ``snapshot`` if the roster changed."""
+    pending = st.session_state.pop("pending_attendance", None)
+    if pending is not None:
+        att = AttendanceSet.from_names(snapshot, pending)
+    else:
+        att = st.session_state.get("attendance")
+        att = AttendanceSet(snapshot) if att is None else att.rebase(snapshot)
+    st.session_state.attendance = att
+    return att
+
+
+def _apply_edits(editor_key, page_rows):
+    edits = st.session_state.get(editor_key, {}).get("edited_rows", {})
+    att = st.session_state.attendance
+    for pos, change in edits.items():
+        if "Present" in change:
+            att.set(page_rows[int(pos)], bool(change["Present"]))
+    bump_generation()
+
+
+def render_year(year, year_rows, snapshot, att):
+    """Draws the Year N section and returns the present row ids of ``year_rows``, in order."""
+    st.markdown(f"<div style='background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 0.5rem 1rem; border-radius: 8px; margin: 1rem 0 0.5rem 0;'><span style='color: white; font-weight: 600; font-size: 1rem;'>Year {year} ({len(year_rows)} students)</span></div>", unsafe_allow_html=True)
+
+    select_all_key = f"select_all_year_{year}"
+    if select_all_key not in st.session_state:
+        st.session_state[select_all_key] = False
+
+    c_all, c_search, c_page = st.columns([2, 3, 1])
+    with c_all:
+        select_all = st.checkbox(f"✓ Select All Year {year}", key=select_all_key)
+        profiling.count("grid.widgets")
+    with c_search:
+        query = st.text_input("Search", key=f"grid_search_{year}", placeholder="Filter by name or register no...", label_visibility="collapsed")
+        profiling.count("grid.widgets")
+
+    names = snapshot.index.names
+    view = year_rows
+    if query:
+        view = year_rows[snapshot.search.mask(query)[year_rows]]
+
+    pages = max(1, -(-len(view) // PAGE_SIZE))
+    with c_page:
+        page = st.number_input("Page", min_value=1, max_value=pages, value=1, step=1, key=f"grid_page_{year}", label_visibility="collapsed")
+        profiling.count("grid.widgets")
+    start = (int(page) - 1) * PAGE_SIZE
+    page_rows = view[start:start + PAGE_SIZE]
+
+    depts = snapshot.df["DEPARTMENT"].to_numpy() if "DEPARTMENT" in snapshot.df.columns else None
+    grid = pd.DataFrame({
+        "Present": True if select_all else att.mask(page_rows),
+        "NAME": names[page_rows],
+        "DEPARTMENT": depts[page_rows] if depts is not None else "",
+    })
+    editor_key = f"grid_{year}_{st.session_state.get('grid_gen', 0)}"
+    st.data_editor(
+        grid,
+        key=editor_key,
+        hide_index=True,
+        width="stretch",
+        disabled=True if select_all else ["NAME", "DEPARTMENT"],
+        column_config={"Present": st.column_config.CheckboxColumn("Present", width="small")},
+        on_change=_apply_edits,
+        args=(editor_key, page_rows),
+    )
+    profiling.count("grid.widgets")
+    profiling.count("grid.rows_rendered", len(page_rows))
+    n_present = len(year_rows) if select_all else att.count(year_rows)
+    if len(view):
+        st.caption(f"Showing {start + 1}–{start + len(page_rows)} of {len(view)} · {n_present} present")
+    else:
+        st.caption("No students match the search.")
+
+    if select_all:
+        return year_rows
+    return year_rows[att.mask(year_rows)]
+
+
+SEARCH_LIMIT = 20
+
+
+def _column(snapshot, name, rows):
+    df = snapshot.df
+    return df[name].to_numpy()[rows] if name in df.columns else [""] * len(rows)
+
+
+def render_search(snapshot, att, selected_rows):
+    """Roster-wide lookup; matches in the current selection can be ticked in place."""
+    query = st.text_input("🔎 Find Student", key="student_search", placeholder="Type a name or register number...")
+    if not query:
+        return
+    hits = snapshot.search.find(query)
+    in_selection = np.zeros(len(snapshot), dtype=bool)
+    in_selection[selected_rows] = True
+    rows = hits[in_selection[hits]]
+    outside = len(hits) - len(rows)
+    profiling.count("search.hits", len(hits))
+
+    if not len(rows):
+        st.caption("No matches in the selected years and departments" + (f" ({outside} elsewhere in the roster)." if outside else "."))
+        return
+    shown = rows[:SEARCH_LIMIT]
+    results = pd.DataFrame({
+        "Present": att.mask(shown),
+        "NAME": snapshot.index.names[shown],
+        "REGISTER NO": _column(snapshot, "REGISTER NO", shown),
+        "YEAR": _column(snapshot, "YEAR", shown),
+        "DEPARTMENT": _column(snapshot, "DEPARTMENT", shown),
+    })
+    editor_key = f"search_{st.session_state.get('grid_gen', 0)}"
+    st.data_editor(
+        results,
+        key=editor_key,
+        hide_index=True,
+        width="stretch",
+        disabled=["NAME", "REGISTER NO", "YEAR", "DEPARTMENT"],
+        column_config={"Present": st.column_config.CheckboxColumn("Present", width="small")},
+        on_change=_apply_edits,
+        args=(editor_key, shown),
+    )
+    note = f"{len(rows)} match{'es' if len(rows) != 1 else ''}"
+    if len(rows) > SEARCH_LIMIT:
+        note += f", showing the first {SEARCH_LIMIT}; keep typing to narrow down"
+    if outside:
+        note += f" · {outside} more outside the selected years and departments"
+    st.caption(note)
+
+
+def render_import(snapshot, att, selected_rows):
+    """Marks everyone matched in an uploaded sign-in sheet or scanner log as present."""
+    with st.expander("📥 Import Attendance (CSV / XLSX)"):
+        upload = st.file_uploader("Sign-in sheet or scanner log", type=["csv", "xlsx"], key="attendance_upload")
+        if upload is None:
+            return
+        try:
+            log = attendance_import.read_log(upload.getvalue(), upload.name)
+        except Exception as e:
+            st.error(f"Could not read {upload.name}: {e}")
+            return
+        columns = st.multiselect(
+            "Columns to match (names or register numbers, tried in order)",
+            list(log.columns),
+            default=attendance_import.guess_columns(log),
+            key="attendance_upload_columns",
+        )
+        if not columns:
+            return
+
+        present, report = attendance_import.match_log(snapshot, log, columns)
+        in_selection = np.zeros(len(snapshot), dtype=bool)
+        in_selection[selected_rows] = True
+        rows = present[in_selection[present]]
+        unmatched = report[report["Matched"] == ""]
+        outside = len(present) - len(rows)
+        profiling.count("import.entries", len(report))
+
+        how = report.loc[report["How"] != "", "How"].value_counts()
+        st.caption(
+            f"{len(report)} entries → {len(present)} students"
+            + (f" ({', '.join(f'{k} {v}' for k, v in how.items())})" if len(how) else "")
+            + (f" · {outside} outside the selected years and departments" if outside else "")
+            + f" · {len(unmatched)} unmatched"
+        )
+        if st.button(f"✅ Mark {len(rows)} present", key="attendance_upload_apply", disabled=not len(rows)):
+            att.set(rows, True)
+            bump_generation()
+            ui_helpers.rerun_fragment()
+        if len(unmatched):
+            st.dataframe(unmatched[["Entry"]], hide_index=True, width="stretch", height=min(300, 35 * (len(unmatched) + 1)))
+            st.download_button(
+                "⬇️ Unmatched rows (CSV)",
+                unmatched[["Entry"]].to_csv(index=False),
+                "unmatched_attendance.csv",
+                mime="text/csv",
+                key="attendance_upload_unmatched",
+            )
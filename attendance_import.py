@@ -0,0 +1,248 @@
+"""Matching sign-in sheets and scanner logs against the roster.
+
+Every entry goes through the same stages, strictest first, and stops at the
+first stage that identifies exactly one student:
+
+    register  digits of a register number / ID
+    exact     name with case, punctuation and spacing normalised
+    compact   the same with all spaces removed ("R.S" vs "R S" vs "RS")
+    reorder   name tokens in any order ("P SHREYA" for "SHREYA P")
+    initials  the name without its initials, if only one student has it and
+              the entry's initials (if any) are among theirs
+    fuzzy     closest compact name with the same first letter (difflib), for
+              what is left, if no other name scores about as well
+
+All but the last are pandas string operations plus a dict lookup, so thousands
+of entries resolve in milliseconds; keys shared by several students are never
+used to match. The fuzzy stage first bounds every candidate's similarity by the
+letters the two names share (numpy, no difflib), and only scores the few
+closest, so unmatched visitors in a scanner log stay cheap.
+"""
+import difflib
+import io
+import os
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+STAGES = ("register", "exact", "compact", "reorder", "initials", "fuzzy")
+FUZZY_CUTOFF = 0.88
+FUZZY_MARGIN = 0.03       # a runner-up this close makes the entry ambiguous
+FUZZY_CANDIDATES = 8      # names difflib scores per entry, best letter bound first
+FUZZY_BLOCK = 4_000_000   # entries x candidates x letters compared per numpy step
+ID_HINTS = ("REG", "ROLL", "ID", "NO")
+NAME_HINTS = ("NAME", "STUDENT")
+
+
+# --- NORMALISATION ---
+def _normalise(values):
+    s = pd.Series(values, dtype=object).fillna("").astype(str).str.upper()
+    s = s.str.replace(r"[^A-Z0-9 ]+", " ", regex=True)
+    return s.str.replace(r"\s+", " ", regex=True).str.strip()
+
+
+def _digits(values):
+    s = pd.Series(values, dtype=object).fillna("").astype(str).str.strip()
+    # Excel turns long IDs into floats ("73772226135.0").
+    s = s.str.replace(r"\.0+$", "", regex=True)
+    return s.str.replace(r"\D+", "", regex=True)
+
+
+def _sorted_tokens(norm):
+    return norm.str.split(" ").map(lambda toks: " ".join(sorted(toks)))
+
+
+def _without_initials(norm):
+    return norm.str.split(" ").map(lambda toks: " ".join(t for t in toks if len(t) > 1))
+
+
+def _initials(norm):
+    return norm.str.split(" ").map(lambda toks: frozenset(t for t in toks if len(t) == 1))
+
+
+# Compact keys only hold A-Z and 0-9.
+_CHAR_INDEX = np.full(128, 0, dtype=np.intp)
+_CHAR_INDEX[np.frombuffer(b"ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789", dtype=np.uint8)] = np.arange(36)
+
+
+def _char_counts(keys):
+    """(counts, lengths): how often each of A-Z0-9 occurs in each key."""
+    lengths = np.fromiter(map(len, keys), dtype=np.intp, count=len(keys))
+    codes = np.frombuffer("".join(keys).encode("ascii"), dtype=np.uint8)
+    counts = np.zeros((len(keys), 36), dtype=np.uint8)
+    np.add.at(counts, (np.repeat(np.arange(len(keys)), lengths), _CHAR_INDEX[codes]), 1)
+    return counts, lengths
+
+
+def _keys(norm, digits):
+    return {
+        "register": digits,
+        "exact": norm,
+        "compact": norm.str.replace(" ", "", regex=False),
+        "reorder": _sorted_tokens(norm),
+        "initials": _without_initials(norm),
+    }
+
+
+def _unique_lookup(keys):
+    """{key: row} for keys that belong to exactly one roster row."""
+    keys = keys[keys != ""]
+    counts = keys.value_counts()
+    unique = keys[keys.map(counts) == 1]
+    return dict(zip(unique.to_numpy(), unique.index.to_numpy()))
+
+
+class RosterMatcher:
+    """Per-snapshot lookup tables; build once with ``matcher(snapshot)``."""
+
+    def __init__(self, snapshot):
+        df = snapshot.df
+        n = len(df)
+        names = df["NAME"] if "NAME" in df.columns else pd.Series([""] * n)
+        regs = df["REGISTER NO"] if "REGISTER NO" in df.columns else pd.Series([""] * n)
+        norm = _normalise(names.to_numpy())
+        keys = _keys(norm, _digits(regs.to_numpy()))
+        self.lookups = {stage: _unique_lookup(k) for stage, k in keys.items()}
+        self.name_keys = keys["initials"].to_numpy()
+        self.initials = _initials(norm).to_numpy()
+        # Every distinct compact name is a fuzzy candidate. Shared ones map to
+        # row -1: they can't be matched, but they still make a near tie ambiguous.
+        compact = keys["compact"]
+        first = ~compact.duplicated() & (compact != "")
+        self.fuzzy_keys = compact[first].to_numpy()
+        self.fuzzy_rows = np.array([self.lookups["compact"].get(k, -1) for k in self.fuzzy_keys], dtype=np.int64)
+        self.fuzzy_name_keys = self.name_keys[first.to_numpy()]
+        self.fuzzy_counts, self.fuzzy_lengths = _char_counts(self.fuzzy_keys)
+        letters = np.array([k[0] for k in self.fuzzy_keys], dtype=object)
+        self.fuzzy_by_letter = {letter: np.flatnonzero(letters == letter) for letter in set(letters)}
+
+    def match(self, entries):
+        """(row ids or -1, stage or "") for each entry, as numpy arrays."""
+        entries = pd.Series(entries, dtype=object).reset_index(drop=True)
+        rows = np.full(len(entries), -1, dtype=np.int64)
+        stage_of = np.full(len(entries), "", dtype=object)
+        norm = _normalise(entries.to_numpy())
+        keys = _keys(norm, _digits(entries.to_numpy()))
+        initials = _initials(norm).to_numpy()
+        # Only all-digit entries are tried as register numbers.
+        keys["register"] = keys["register"].where(keys["exact"].str.fullmatch(r"[0-9 ]+"), "")
+
+        for stage in STAGES[:-1]:
+            todo = rows < 0
+            if not todo.any():
+                break
+            found = keys[stage][todo].map(self.lookups[stage])
+            hit = found.notna().to_numpy()
+            idx = np.flatnonzero(todo)[hit]
+            found = found.to_numpy()[hit].astype(np.int64)
+            if stage == "initials":
+                # "PRIYA K" is not "PRIYA V", even if she is the only PRIYA.
+                agree = np.array([initials[i] <= self.initials[r] for i, r in zip(idx, found)], dtype=bool)
+                idx, found = idx[agree], found[agree]
+            rows[idx] = found
+            stage_of[idx] = stage
+
+        compact = keys["compact"].to_numpy()
+        todo = np.flatnonzero((rows < 0) & (keys["compact"].str.len() >= 4).to_numpy())
+        if len(todo):
+            found = self._fuzzy(compact[todo], keys["initials"].to_numpy()[todo])
+            hit = found >= 0
+            rows[todo[hit]] = found[hit]
+            stage_of[todo[hit]] = "fuzzy"
+        return rows, stage_of
+
+    def _fuzzy(self, keys, name_keys):
+        """Roster row (or -1) for each compact key, from its unambiguous closest name."""
+        out = np.full(len(keys), -1, dtype=np.int64)
+        counts, lengths = _char_counts(keys)
+        letters = np.array([k[0] for k in keys], dtype=object)
+        for letter in set(letters):
+            cand = self.fuzzy_by_letter.get(letter)
+            if cand is None:
+                continue
+            entries = np.flatnonzero(letters == letter)
+            cand_counts, cand_lengths = self.fuzzy_counts[cand], self.fuzzy_lengths[cand]
+            step = max(1, FUZZY_BLOCK // (36 * len(cand)))
+            for start in range(0, len(entries), step):
+                block = entries[start:start + step]
+                # Letters in common bound difflib's ratio from above (it is its quick_ratio).
+                common = np.minimum(counts[block, None, :], cand_counts[None, :, :]).sum(axis=2)
+                bound = 2.0 * common / (lengths[block, None] + cand_lengths[None, :])
+                for i, b in zip(block, bound):
+                    near = np.flatnonzero(b >= FUZZY_CUTOFF)
+                    if len(near):
+                        near = near[np.argsort(-b[near], kind="stable")[:FUZZY_CANDIDATES]]
+                        out[i] = self._closest(keys[i], name_keys[i], cand[near])
+        return out
+
+    def _closest(self, key, name_key, candidates):
+        """Row of the best-scoring candidate, or -1 if none passes or the best is not clear."""
+        scored = []
+        sm = difflib.SequenceMatcher()
+        sm.set_seq2(key)
+        for c in candidates:
+            # Same name apart from initials: the initials stage already refused it
+            # (shared by several students, or the initials conflict).
+            if self.fuzzy_name_keys[c] == name_key:
+                continue
+            sm.set_seq1(self.fuzzy_keys[c])
+            ratio = sm.ratio()
+            if ratio >= FUZZY_CUTOFF:
+                scored.append((ratio, c))
+        if not scored:
+            return -1
+        scored.sort(reverse=True)
+        if len(scored) > 1 and scored[0][0] - scored[1][0] < FUZZY_MARGIN:
+            return -1
+        return self.fuzzy_rows[scored[0][1]]
+
+
+@lru_cache(maxsize=4)
+def matcher(snapshot):
+    return RosterMatcher(snapshot)
+
+
+# --- FILES ---
+def read_log(data, filename):
+    """A DataFrame from the bytes of an uploaded CSV or XLSX file (all cells as text)."""
+    ext = os.path.splitext(filename)[1].lower()
+    if ext in (".xlsx", ".xls"):
+        return pd.read_excel(io.BytesIO(data), dtype=str)
+    return pd.read_csv(io.BytesIO(data), dtype=str, sep=None, engine="python")
+
+
+def guess_columns(df):
+    """Columns worth matching: ID-like and name-like headers, else every column."""
+    cols = [c for c in df.columns if any(h in str(c).upper() for h in ID_HINTS + NAME_HINTS)]
+    return cols or list(df.columns)
+
+
+def match_log(snapshot, df, columns):
+    """Matches each row of ``df`` using the first of ``columns`` that resolves.
+
+    Returns (present row ids, report DataFrame with one line per input row).
+    """
+    m = matcher(snapshot)
+    n = len(df)
+    rows = np.full(n, -1, dtype=np.int64)
+    stages = np.full(n, "", dtype=object)
+    for col in columns:
+        todo = np.flatnonzero(rows < 0)
+        if not len(todo):
+            break
+        found, how = m.match(df[col].to_numpy()[todo])
+        hit = found >= 0
+        rows[todo[hit]] = found[hit]
+        stages[todo[hit]] = how[hit]
+
+    names = snapshot.index.names
+    cells = [df[c].fillna("").astype(str) for c in columns]
+    entry = cells[0].str.cat(cells[1:], sep=" | ") if cells else pd.Series([""] * n)
+    report = pd.DataFrame({
+        "Entry": entry.to_numpy(),
+        "Matched": [names[r] if r >= 0 else "" for r in rows],
+        "How": stages,
+    })
+    present = np.unique(rows[rows >= 0]).astype(np.int32)
+    return present, report
@@ -0,0 +1,82 @@
+"""How DOCX generation time scales with attendee count.
+
+Compares python-docx's per-row API (the previous implementation) against the
+batched XML emission in report_builder, and times a full build_docx() run.
+
+    python benchmarks/bench_docx_tables.py [--sizes 50,200,500,1000,2000]
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from docx.enum.text import WD_ALIGN_PARAGRAPH  # noqa: E402
+
+import report_assets  # noqa: E402
+import report_builder  # noqa: E402
+
+
+def _students(n):
+    depts = ["AI&DS", "CSE", "ECE", "IT", "MECH"]
+    return [{"NAME": f"STUDENT {i:05d}", "YEAR": 1 + i % 4, "DEPARTMENT": depts[i % len(depts)]} for i in range(n)]
+
+
+def per_row(students):
+    doc = report_assets.template_document()
+    table = doc.add_table(rows=1, cols=4)
+    table.style = "Table Grid"
+    for i, s in enumerate(students, start=1):
+        row_cells = table.add_row().cells
+        row_cells[0].text = str(i)
+        row_cells[0].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+        row_cells[1].text = str(s["NAME"])
+        row_cells[2].text = str(s.get("YEAR", ""))
+        row_cells[2].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+        row_cells[3].text = str(s.get("DEPARTMENT", ""))
+        row_cells[3].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+
+def batched(students):
+    doc = report_assets.template_document()
+    table = doc.add_table(rows=1, cols=4)
+    table.style = "Table Grid"
+    report_builder.append_rows(table, (
+        [(str(i), True), (str(s["NAME"]), False), (str(s.get("YEAR", "")), True), (str(s.get("DEPARTMENT", "")), True)]
+        for i, s in enumerate(students, start=1)
+    ))
+
+
+def full_build(students):
+    report_builder.build_docx({"date": date(2026, 1, 1), "time": "04.00 PM", "students": students, "points": []})
+
+
+def best_of(fn, arg, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(arg)
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="50,200,500,1000,2000")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    full_build(_students(1))  # warm the asset cache
+    print(f"{'attendees':>10} {'per-row (s)':>12} {'batched (s)':>12} {'speed-up':>9} {'build_docx (s)':>15}")
+    for n in [int(x) for x in args.sizes.split(",")]:
+        students = _students(n)
+        slow = best_of(per_row, students, args.repeat)
+        fast = best_of(batched, students, args.repeat)
+        full = best_of(full_build, students, args.repeat)
+        print(f"{n:>10} {slow:>12.4f} {fast:>12.4f} {slow / fast:>8.1f}x {full:>15.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""PDF render time and file size as the attendance list and discussion grow.
+
+    python benchmarks/bench_pdf.py [--sizes 100,500,2000,5000] [--points N]
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import report_builder  # noqa: E402
+
+
+def _meeting(n, n_points):
+    depts = ["AI&DS", "CSE", "ECE", "IT", "MECH"]
+    return {
+        "date": date(2026, 1, 1),
+        "time": "04.00 PM",
+        "students": [{"NAME": f"STUDENT {i:05d}", "YEAR": 1 + i % 4, "DEPARTMENT": depts[i % len(depts)]} for i in range(n)],
+        "points": [
+            {"topic": f"Topic {k}", "discussion": "\n".join(f"Action item {j} agreed for the next event, owners to report back" for j in range(k % 15 + 1))}
+            for k in range(n_points)
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="100,500,2000,5000")
+    parser.add_argument("--points", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    report_builder.build_pdf(_meeting(1, 0))  # warm the asset cache
+    print(f"{'attendees':>10} {'best (s)':>10} {'KiB':>8}")
+    for n in [int(x) for x in args.sizes.split(",")]:
+        meeting = _meeting(n, args.points)
+        best, size = None, 0
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            data = report_builder.build_pdf(meeting)
+            elapsed = time.perf_counter() - t0
+            best = elapsed if best is None else min(best, elapsed)
+            size = len(data)
+        print(f"{n:>10} {best:>10.4f} {size / 1024:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Cold-start cost of the app: module import time and first paint.
+
+Each measurement runs in a fresh interpreter, like a new Streamlit worker.
+"First paint" is a full AppTest run of Index.py; the script also checks that
+the report stack (python-docx, fpdf) was not loaded to draw the form.
+
+    python benchmarks/bench_startup.py [--repeat 5]
+"""
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORTS = """
+import json, sys, time
+t0 = time.perf_counter()
+import streamlit
+t1 = time.perf_counter()
+import Index_deps
+print(json.dumps({"streamlit": t1 - t0, "seconds": time.perf_counter() - t1}))
+"""
+
+
+def app_modules():
+    """The modules Index.py imports at the top, minus Streamlit and the standard library."""
+    with open(os.path.join(ROOT, "Index.py"), encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.level == 0:
+            names = [node.module]
+        else:
+            continue
+        for name in names:
+            top = name.split(".")[0]
+            if top != "streamlit" and top not in sys.stdlib_module_names and name not in modules:
+                modules.append(name)
+    return modules
+
+
+FIRST_PAINT = """
+import json, sys, time
+t0 = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+t1 = time.perf_counter()
+at = AppTest.from_file("Index.py", default_timeout=120).run()
+t2 = time.perf_counter()
+print(json.dumps({
+    "seconds": t2 - t1,
+    "framework": t1 - t0,
+    "exception": bool(at.exception),
+    "report_stack_loaded": any(m in sys.modules for m in ("docx", "fpdf")),
+}))
+"""
+
+
+def run(code):
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    imports = IMPORTS.replace("Index_deps", ", ".join(app_modules()))
+    imported = [run(imports) for _ in range(args.repeat)]
+    st_times = sorted(i["streamlit"] for i in imported)
+    import_times = sorted(i["seconds"] for i in imported)
+    paints = [run(FIRST_PAINT) for _ in range(args.repeat)]
+    paint_times = sorted(p["seconds"] for p in paints)
+
+    print(f"{'':>14} {'best (s)':>10} {'median (s)':>11}")
+    print(f"{'streamlit':>14} {st_times[0]:>10.3f} {st_times[len(st_times) // 2]:>11.3f}")
+    print(f"{'app imports':>14} {import_times[0]:>10.3f} {import_times[len(import_times) // 2]:>11.3f}")
+    print(f"{'first paint':>14} {paint_times[0]:>10.3f} {paint_times[len(paint_times) // 2]:>11.3f}")
+    print(f"report stack loaded on first paint: {'yes' if any(p['report_stack_loaded'] for p in paints) else 'no'}")
+    if any(p["exception"] for p in paints):
+        print("warning: Index.py raised during first paint")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+"""Concurrent-session load test: many coordinators driving Index.py at once.
+
+    python benchmarks/load_test.py                               # 8 sessions, 5k roster
+    python benchmarks/load_test.py --sessions 32 --students 20000 --think 0.2
+    python benchmarks/load_test.py --sessions 32 --servers 4 --json load.json
+
+Each session is a headless AppTest walking the coordinator's script: open the
+page, pick years and departments, filter and tick a year, look a student up,
+add discussion points, save the draft and generate the reports (polling until
+they are ready). Every rerun is timed from the moment the session asks for it,
+so latency includes time spent queued behind other sessions.
+
+AppTest swaps a process-global runtime for each run, so runs inside one server
+process are serialised; that is also roughly what one Streamlit server does
+with CPU-bound reruns under the GIL. ``--servers`` spreads the sessions over
+that many processes, like replicas behind a load balancer. AppTest only does
+full reruns, so fragment reruns are measured as full reruns (an upper bound).
+
+Everything runs locally: the roster is a synthetic sheet from benchmarks/.data
+and drafts, roster snapshots and reports go to a temporary directory.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+DATA_DIR = os.path.join(HERE, ".data")
+PERCENTILES = (50, 95, 99)
+
+
+# --- SESSION SCRIPT ---
+class Session:
+    """One coordinator: an AppTest plus the timings of every rerun it asked for."""
+
+    def __init__(self, server, sid, rng, args):
+        from streamlit.testing.v1 import AppTest
+        self.server = server
+        self.sid = sid
+        self.rng = rng
+        self.args = args
+        self.at = AppTest.from_file(os.path.join(ROOT, "Index.py"), default_timeout=args.timeout)
+        self.samples = []  # (action, ms)
+        self.reports = []  # ms from clicking Generate to the downloads
+        self.errors = []
+
+    def run(self, action, element=None):
+        """Reruns the script (through ``element`` if given) and records the latency."""
+        t0 = time.perf_counter()
+        with self.server.lock:
+            (element or self.at).run()
+        self.samples.append((action, (time.perf_counter() - t0) * 1000.0))
+        if self.at.exception:
+            self.errors.append(f"{action}: {self.at.exception[0].message}")
+
+    def think(self):
+        if self.args.think:
+            time.sleep(self.rng.expovariate(1.0 / self.args.think))
+
+    def widget(self, kind, label):
+        return next(w for w in getattr(self.at, kind) if w.label == label)
+
+    def script(self):
+        rng, snap = self.rng, self.server.snapshot
+        years = rng.sample(snap.index.years, min(len(snap.index.years), rng.randint(1, 2)))
+        depts = rng.sample(snap.index.departments, min(len(snap.index.departments), rng.randint(2, 5)))
+
+        self.run("select_years", self.widget("multiselect", "Select Year(s)").set_value(years))
+        self.think()
+        self.run("select_depts", self.widget("multiselect", "Select Department(s)").set_value(depts))
+        self.think()
+        year = years[0]
+        prefix = rng.choice(snap.index.names)[:2]
+        self.run("grid_search", self.at.text_input(key=f"grid_search_{year}").input(prefix))
+        self.think()
+        self.run("select_all", self.at.checkbox(key=f"select_all_year_{year}").check())
+        self.think()
+        self.run("find_student", self.at.text_input(key="student_search").input(rng.choice(snap.index.names)[:5]))
+        self.think()
+        for k in range(self.args.points):
+            self.widget("text_input", "Topic Title").input(f"Topic {self.sid}.{k}")
+            self.at.text_area[0].input(f"Discussion {k} for session {self.sid}\nOwners to report back next week")
+            self.run("add_point", next(b for b in self.at.button if "Add Point" in str(b.label)).click())
+            self.think()
+        self.run("save", self.at.button(key="save_bottom").click())
+        self.think()
+        if self.args.reports:
+            self.generate()
+
+    def generate(self):
+        t0 = time.perf_counter()
+        self.run("generate", self.at.button(key="gen_bottom").click())
+        deadline = t0 + self.args.timeout
+        while time.perf_counter() < deadline:
+            if self.at.success and any("Reports Generated" in s.value for s in self.at.success):
+                self.reports.append((time.perf_counter() - t0) * 1000.0)
+                return
+            if self.at.error:
+                return  # the app shows the job's exception, which run() recorded
+            time.sleep(self.args.poll)
+            self.run("poll")
+        self.errors.append("generate: timed out")
+
+    def main(self, start_delay):
+        time.sleep(start_delay)
+        try:
+            self.run("open")
+            for _ in range(self.args.loops):
+                self.script()
+        except Exception as e:
+            self.errors.append(f"{type(e).__name__}: {e}")
+
+
+# --- SERVER PROCESS ---
+class Server:
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+        self.lock = threading.Lock()
+
+
+def _rss_bytes():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return 0
+
+
+def _peak_rss_bytes():
+    try:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    except ImportError:
+        return 0
+
+
+def serve(server_no, n_sessions, xlsx, work_dir, args):
+    """Runs ``n_sessions`` concurrent sessions in this process; returns its results."""
+    # The app reads these when its modules are imported.
+    os.environ["MOM_ROSTER"] = xlsx
+    os.environ["MOM_DRAFTS_DIR"] = os.path.join(work_dir, "drafts")
+    os.makedirs(os.environ["MOM_DRAFTS_DIR"], exist_ok=True)
+    sys.path.insert(0, ROOT)
+    if "fork" in multiprocessing.get_all_start_methods():
+        # Spawned servers default to spawn, whose report workers would re-import
+        # Index.py as __main__; a real server uses the platform default.
+        multiprocessing.set_start_method("fork", force=True)
+    import streamlit.config
+    import streamlit.logger
+    # AppTest touches session state outside a script run, which warns every time.
+    # Parse the config first, or parsing it later resets the level.
+    streamlit.config.get_config_options()
+    streamlit.config.set_option("logger.level", "error")
+    streamlit.logger.set_log_level("error")
+
+    import memory_report
+    import report_jobs
+    import roster_store
+    roster_store.CACHE_DIR = os.path.join(work_dir, f"roster_cache_{server_no}")
+    snapshot = roster_store.get_roster(xlsx)
+    server = Server(snapshot)
+    rss_start = _rss_bytes()
+
+    rng = random.Random(args.seed * 1000 + server_no)
+    sessions = [Session(server, f"{server_no}.{i}", random.Random(rng.random()), args) for i in range(n_sessions)]
+    threads = [
+        threading.Thread(target=s.main, args=(rng.uniform(0, args.ramp),), daemon=True)
+        for s in sessions
+    ]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    # The app never shuts its report pool down; this process can't exit until it does.
+    report_jobs._get_executor().shutdown()
+
+    state_bytes = [
+        sum(size for _, size in memory_report.session_bytes(s.at._session_state.filtered_state))
+        for s in sessions
+    ]
+    return {
+        "elapsed": elapsed,
+        "samples": [x for s in sessions for x in s.samples],
+        "reports": [x for s in sessions for x in s.reports],
+        "errors": [e for s in sessions for e in s.errors],
+        "rss_start": rss_start,
+        "rss_end": _rss_bytes(),
+        "rss_peak": _peak_rss_bytes(),
+        "session_state": state_bytes,
+    }
+
+
+# --- REPORT ---
+def _percentiles(values):
+    import numpy as np
+    if not values:
+        return {f"p{p}": None for p in PERCENTILES}
+    return {f"p{p}": round(float(np.percentile(values, p)), 1) for p in PERCENTILES}
+
+
+def summarise(results, args):
+    samples = [tuple(x) for r in results for x in r["samples"]]
+    elapsed = max(r["elapsed"] for r in results)
+    actions = {}
+    for action, ms in samples:
+        actions.setdefault(action, []).append(ms)
+    reports = [x for r in results for x in r["reports"]]
+    state = [x for r in results for x in r["session_state"]]
+    return {
+        "config": {k: v for k, v in vars(args).items() if k != "json"},
+        "elapsed_s": round(elapsed, 2),
+        "reruns": len(samples),
+        "throughput_rps": round(len(samples) / elapsed, 2) if elapsed else None,
+        "latency_ms": _percentiles([ms for _, ms in samples]),
+        "actions": {a: {"n": len(v), **_percentiles(v), "max": round(max(v), 1)} for a, v in sorted(actions.items())},
+        "reports_ready_ms": _percentiles(reports),
+        "reports_done": len(reports),
+        "errors": [e for r in results for e in r["errors"]],
+        "memory_mib": {
+            "rss_peak_per_server": [round(r["rss_peak"] / 2**20, 1) for r in results],
+            "rss_growth_per_server": [round((r["rss_end"] - r["rss_start"]) / 2**20, 1) for r in results],
+            "session_state_mean_kib": round(sum(state) / len(state) / 1024, 1) if state else None,
+        },
+    }
+
+
+def _ms(v):
+    return f"{v:>9.1f}" if v is not None else f"{'-':>9}"
+
+
+def print_summary(s):
+    cfg = s["config"]
+    print(f"{cfg['sessions']} sessions on {cfg['servers']} server(s), {cfg['students']} students, think {cfg['think']}s")
+    print(f"{s['reruns']} reruns in {s['elapsed_s']} s  →  {s['throughput_rps']} reruns/s\n")
+    print(f"{'action':<14} {'n':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for action, a in s["actions"].items():
+        print(f"{action:<14} {a['n']:>6} {_ms(a['p50'])} {_ms(a['p95'])} {_ms(a['p99'])} {_ms(a['max'])}")
+    lat = s["latency_ms"]
+    print(f"{'all reruns':<14} {s['reruns']:>6} {_ms(lat['p50'])} {_ms(lat['p95'])} {_ms(lat['p99'])}")
+    rep = s["reports_ready_ms"]
+    if s["reports_done"]:
+        print(f"{'reports ready':<14} {s['reports_done']:>6} {_ms(rep['p50'])} {_ms(rep['p95'])} {_ms(rep['p99'])}")
+    mem = s["memory_mib"]
+    print(f"\npeak RSS per server (MiB): {mem['rss_peak_per_server']}  growth: {mem['rss_growth_per_server']}")
+    print(f"session state: {mem['session_state_mean_kib']} KiB per session (mean)")
+    if s["errors"]:
+        print(f"\n{len(s['errors'])} error(s):")
+        for e in s["errors"][:10]:
+            print(f"  {e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument("--servers", type=int, default=1, help="server processes to spread the sessions over")
+    parser.add_argument("--students", type=int, default=5000)
+    parser.add_argument("--points", type=int, default=3, help="discussion points each session adds")
+    parser.add_argument("--loops", type=int, default=1, help="times each session repeats its script")
+    parser.add_argument("--think", type=float, default=0.5, help="mean pause between actions (s)")
+    parser.add_argument("--ramp", type=float, default=2.0, help="sessions start at random over this many seconds")
+    parser.add_argument("--poll", type=float, default=0.5, help="report polling interval (s)")
+    parser.add_argument("--no-reports", dest="reports", action="store_false")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="also write the summary to this file")
+    args = parser.parse_args()
+
+    sys.path.insert(0, HERE)
+    import synthetic
+    xlsx = synthetic.roster_xlsx(args.students, DATA_DIR, seed=args.seed)
+
+    counts = [args.sessions // args.servers + (i < args.sessions % args.servers) for i in range(args.servers)]
+    with tempfile.TemporaryDirectory() as work_dir:
+        # Spawned, so each server imports the app fresh with its own environment.
+        with ProcessPoolExecutor(max_workers=args.servers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            futures = [pool.submit(serve, i, n, xlsx, work_dir, args) for i, n in enumerate(counts) if n]
+            results = [f.result() for f in futures]
+
+    summary = summarise(results, args)
+    print_summary(summary)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
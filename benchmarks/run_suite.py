@@ -0,0 +1,168 @@
+"""Benchmark suite over synthetic rosters: load, filter, drafts and reports.
+
+    python benchmarks/run_suite.py                         # 1k-50k students
+    python benchmarks/run_suite.py --sizes 1000,5000 --save local
+    python benchmarks/run_suite.py --compare local         # ratio vs a saved baseline
+
+Synthetic sheets are cached in benchmarks/.data; roster snapshots and drafts go
+to a temporary directory, so the app's own .roster_cache and drafts are never
+touched. Baselines are JSON files in benchmarks/baselines.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, ROOT)
+
+import draft_store  # noqa: E402
+import report_engine  # noqa: E402
+import roster_store  # noqa: E402
+import synthetic  # noqa: E402
+from attendance import AttendanceSet  # noqa: E402
+from roster_index import RosterIndex  # noqa: E402
+from roster_search import SearchIndex  # noqa: E402
+
+BASELINE_DIR = os.path.join(HERE, "baselines")
+DATA_DIR = os.path.join(HERE, ".data")
+REGRESSION = 1.2  # flag anything this much slower than the baseline...
+NOISE_MS = 0.1    # ...and slower by more than this, so microsecond jitter isn't flagged
+
+
+def measure(fn, repeat):
+    """Best and median of ``repeat`` timed calls, after one untimed warm-up call."""
+    fn()
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1000.0)
+    return {"best_ms": round(min(times), 3), "median_ms": round(statistics.median(times), 3)}
+
+
+def suite(n, args, work_dir):
+    """Yields (name, fn, repeat) for one roster size."""
+    xlsx = synthetic.roster_xlsx(n, DATA_DIR, seed=args.seed)
+    snap = roster_store.rebuild(xlsx)
+    stat_key = roster_store._stat_key(xlsx)
+    idx = snap.index
+    years, depts = idx.years, idx.departments
+    names = idx.names.tolist()
+
+    # --- load_data ---
+    yield "load_data.parse_xlsx", lambda: roster_store.rebuild(xlsx), args.slow_repeat
+    yield "load_data.snapshot", lambda: roster_store._load_cold(xlsx, stat_key), args.repeat
+    roster_store.get_roster(xlsx)
+    yield "load_data.warm", lambda: roster_store.get_roster(xlsx), args.repeat * 10
+
+    # --- filter and grouping ---
+    yield "filter.index_build", lambda: RosterIndex(snap.df), args.repeat
+    yield "filter.all_years", lambda: idx.rows_by_year(years, depts), args.repeat * 10
+    yield "filter.one_dept", lambda: idx.rows(years, depts[:1]), args.repeat * 10
+    yield "search.build", lambda: SearchIndex(snap.df, idx.rank), args.slow_repeat
+    search = snap.search
+    yield "search.prefix", lambda: search.find("ra"), args.repeat * 10
+    yield "search.substring", lambda: search.find("anth"), args.repeat * 10
+    half = names[: len(names) // 2]
+    yield "attendance.from_names", lambda: AttendanceSet.from_names(snap, half), args.repeat
+
+    # --- drafts ---
+    db = os.path.join(work_dir, f"drafts_{n}.db")
+    draft = synthetic.drafts(snap, 1, present=0.5, n_points=args.points, seed=args.seed)[0]
+    draft_id, _ = draft_store.save(draft, db_path=db)
+    yield "draft.save", lambda: draft_store.save(draft, db_path=db), args.repeat
+    yield "draft.load", lambda: draft_store.load(draft_id, db_path=db), args.repeat
+    toggled = dict(draft, attendance=draft["attendance"][10:])
+    ops = draft_store.diff_ops(draft, toggled)
+    yield "draft.append_ops", lambda: draft_store.append_ops(draft_id, ops, db_path=db), args.repeat
+
+    # --- reports ---
+    cap = min(len(draft["attendance"]), args.report_cap)
+    meeting = report_engine.meeting_from_draft(dict(draft, attendance=draft["attendance"][:cap]), snap)
+    for kind in report_engine.KINDS:
+        yield f"report.{kind}", lambda kind=kind: report_engine.render(kind, meeting), args.slow_repeat
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,5000,20000,50000")
+    parser.add_argument("--points", type=int, default=30, help="discussion points per meeting")
+    parser.add_argument("--report-cap", type=int, default=2000, help="max attendees per rendered report")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--slow-repeat", type=int, default=3, help="repeats for sheet parsing and reports")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", help="run benchmarks whose name starts with this prefix")
+    parser.add_argument("--save", metavar="NAME", help="store results as baselines/NAME.json")
+    parser.add_argument("--compare", metavar="NAME", help="compare against baselines/NAME.json")
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.compare:
+        with open(os.path.join(BASELINE_DIR, f"{args.compare}.json")) as f:
+            baseline = json.load(f)["results"]
+
+    results = {}
+    regressions = []
+    print(f"{'benchmark':<32} {'best (ms)':>11} {'median (ms)':>12} {'vs base':>8}")
+    with tempfile.TemporaryDirectory() as work_dir:
+        roster_store.CACHE_DIR = os.path.join(work_dir, "roster_cache")
+        for n in [int(x) for x in args.sizes.split(",")]:
+            for name, fn, repeat in suite(n, args, work_dir):
+                if args.only and not name.startswith(args.only):
+                    continue
+                key = f"{name}[{n}]"
+                try:
+                    result = measure(fn, repeat)
+                except Exception as e:
+                    results[key] = {"error": f"{type(e).__name__}: {e}"}
+                    print(f"{key:<32} {'error: ' + type(e).__name__:>33}")
+                    continue
+                results[key] = result
+                ratio = ""
+                base = baseline.get(key, {}).get("best_ms")
+                if base:
+                    r = result["best_ms"] / base
+                    ratio = f"{r:.2f}x"
+                    if r > REGRESSION and result["best_ms"] - base > NOISE_MS:
+                        regressions.append(key)
+                        ratio += " !"
+                print(f"{key:<32} {result['best_ms']:>11.3f} {result['median_ms']:>12.3f} {ratio:>8}")
+
+    if args.save:
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        out = {
+            "meta": {
+                "commit": _git_commit(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+                "args": {k: v for k, v in vars(args).items() if k not in ("save", "compare")},
+            },
+            "results": results,
+        }
+        path = os.path.join(BASELINE_DIR, f"{args.save}.json")
+        with open(path, "w") as f:
+            json.dump(out, f, indent=1, sort_keys=True)
+        print(f"Saved {path}")
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) more than {REGRESSION:.1f}x slower than '{args.compare}': {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""Synthetic rosters and meetings shaped like the real data.
+
+Rosters use the students.xlsx columns and its department/year layout (including
+the legacy "AIDS" spelling and duplicate names that build_frame cleans up), so
+every benchmark goes through the same normalisation as production.
+"""
+import os
+import random
+from datetime import date, timedelta
+
+import pandas as pd
+
+DEPARTMENTS = ["AI&DS", "AIDS", "CIVIL", "CSBS", "CSE", "ECE", "EEE", "FT", "IT", "MCT", "MECH", "Mechanical", "TXT", "VLSIDT"]
+# Roughly the spread in students.xlsx: most volunteers are in 2nd year.
+YEAR_WEIGHTS = {1: 2, 2: 5, 3: 3, 4: 1}
+INITIALS = "ABCDEFGHIJKLMNOPRSTVY"
+SYLLABLES = ["ra", "ma", "ni", "ka", "vi", "sh", "an", "th", "ar", "ja", "la", "pr", "ee", "su", "dh", "ya", "na", "ha"]
+
+
+def _name(rng):
+    first = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).upper()
+    return f"{first} {rng.choice(INITIALS)}" + (f".{rng.choice(INITIALS)}" if rng.random() < 0.2 else "")
+
+
+def roster_frame(n, seed=0):
+    """``n`` students with ~1% duplicate names, as they appear in the raw sheet."""
+    rng = random.Random(seed)
+    years = rng.choices(list(YEAR_WEIGHTS), weights=list(YEAR_WEIGHTS.values()), k=n)
+    names = []
+    for i in range(n):
+        names.append(rng.choice(names) if names and rng.random() < 0.01 else f"{_name(rng)} {i:05d}")
+    return pd.DataFrame({
+        "S NO": range(1, n + 1),
+        "NAME": names,
+        "YEAR": years,
+        "DEPARTMENT": [rng.choice(DEPARTMENTS) for _ in range(n)],
+        "REGISTER NO": [f"7{rng.randint(10, 99)}{y + 20}{rng.randint(0, 999999):06d}" for y in years],
+        "MAIL ID": [f"student{i}@example.com" for i in range(n)],
+        "PHONE NUMBER": [rng.randint(6_000_000_000, 9_999_999_999) if rng.random() < 0.9 else "N/A" for _ in range(n)],
+    })
+
+
+def roster_xlsx(n, data_dir, seed=0):
+    """Path to a synthetic roster sheet, written once and reused across runs."""
+    os.makedirs(data_dir, exist_ok=True)
+    path = os.path.join(data_dir, f"roster_{n}_{seed}.xlsx")
+    if not os.path.exists(path):
+        tmp = f"{path}.tmp.xlsx"
+        roster_frame(n, seed).to_excel(tmp, index=False)
+        os.replace(tmp, path)
+    return path
+
+
+def points(n, seed=0):
+    """Discussion points with 1-15 lines each."""
+    rng = random.Random(seed)
+    return [
+        {
+            "topic": f"Topic {k + 1}: {rng.choice(['Event planning', 'Budget', 'Volunteers', 'Outreach', 'Logistics'])}",
+            "discussion": "\n".join(
+                f"Action item {j + 1}: {rng.choice(['owners to report back', 'agreed for next week', 'pending approval', 'venue confirmed'])}"
+                for j in range(rng.randint(1, 15))
+            ),
+        }
+        for k in range(n)
+    ]
+
+
+def drafts(snapshot, n_meetings, present=0.5, n_points=5, seed=0):
+    """Draft documents for ``n_meetings`` weekly meetings over the snapshot's roster."""
+    rng = random.Random(seed)
+    names = snapshot.index.names.tolist()
+    years, depts = snapshot.index.years, snapshot.index.departments
+    start = date(2025, 1, 6)
+    out = []
+    for k in range(n_meetings):
+        out.append({
+            "date": str(start + timedelta(weeks=k)),
+            "time": "04.00 PM",
+            "year": [int(y) for y in years],
+            "department": list(depts),
+            "points": points(n_points, seed + k),
+            "attendance": rng.sample(names, int(len(names) * present)),
+        })
+    return out
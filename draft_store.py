@@ -0,0 +1,446 @@
+"""SQLite (WAL) backend for meeting drafts.
+
+Each draft is one row holding the same JSON document the app used to write to
+``drafts/<date>.json``; listing is an indexed query instead of a directory scan,
+and any number of drafts can share a date. Existing JSON drafts are imported
+once, the first time the store is opened.
+
+Every draft carries a version stamp; writes are compare-and-swap against the
+version a session last read, and a short lease records who is editing it.
+
+Autosave appends small delta ops to a per-draft journal instead of rewriting the
+document; ``load`` replays them and the journal is folded back into the
+document every ``COMPACT_EVERY`` ops.
+
+Discussion points are also kept in an FTS5 index, updated in the same
+transaction as every write that changes them, for ``search_points``.
+"""
+import glob
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+DRAFTS_DIR = os.environ.get("MOM_DRAFTS_DIR", "drafts")
+DB_PATH = os.path.join(DRAFTS_DIR, "drafts.db")
+COMPACT_EVERY = 50
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS drafts (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    draft_date  TEXT NOT NULL,
+    created_at  REAL NOT NULL,
+    updated_at  REAL NOT NULL,
+    data        TEXT NOT NULL,
+    version     INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS drafts_by_date ON drafts (draft_date DESC, updated_at DESC);
+CREATE TABLE IF NOT EXISTS journal (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    draft_id    INTEGER NOT NULL,
+    created_at  REAL NOT NULL,
+    op          TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS journal_by_draft ON journal (draft_id, id);
+CREATE TABLE IF NOT EXISTS leases (
+    draft_id    INTEGER PRIMARY KEY,
+    holder      TEXT NOT NULL,
+    holder_name TEXT,
+    expires_at  REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# Porter stemming so "volunteer" also finds "volunteers"; point_no is 1-based.
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS points_fts USING fts5(
+    draft_id UNINDEXED, point_no UNINDEXED, topic, discussion,
+    tokenize = 'porter unicode61'
+);
+"""
+
+_local = threading.local()
+_init_lock = threading.Lock()
+_initialised = set()
+_fts_ready = {}  # db path -> whether this SQLite build has FTS5
+
+
+def connect(db_path=DB_PATH):
+    """Per-thread connection; the schema and JSON import run once per process."""
+    conns = getattr(_local, "conns", None)
+    if conns is None:
+        conns = _local.conns = {}
+    conn = conns.get(db_path)
+    if conn is None:
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        conn = sqlite3.connect(db_path, timeout=10, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conns[db_path] = conn
+        with _init_lock:
+            if db_path not in _initialised:
+                conn.executescript(SCHEMA)
+                columns = {r[1] for r in conn.execute("PRAGMA table_info(drafts)")}
+                if "version" not in columns:
+                    conn.execute("ALTER TABLE drafts ADD COLUMN version INTEGER NOT NULL DEFAULT 1")
+                import_json_drafts(conn, os.path.dirname(db_path) or ".")
+                _fts_ready[db_path] = _init_fts(conn)
+                _initialised.add(db_path)
+    return conn
+
+
+def import_json_drafts(conn, drafts_dir):
+    """One-shot import of legacy ``<date>.json`` drafts; recorded in the meta table."""
+    if conn.execute("SELECT 1 FROM meta WHERE key = 'json_imported'").fetchone():
+        return 0
+    count = 0
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        for path in sorted(glob.glob(os.path.join(drafts_dir, "*.json"))):
+            try:
+                with open(path, "r") as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            mtime = os.path.getmtime(path)
+            draft_date = str(data.get("date") or os.path.basename(path)[:-len(".json")])
+            conn.execute(
+                "INSERT INTO drafts (draft_date, created_at, updated_at, data) VALUES (?, ?, ?, ?)",
+                (draft_date, mtime, mtime, json.dumps(data)),
+            )
+            count += 1
+        conn.execute("INSERT INTO meta (key, value) VALUES ('json_imported', ?)", (str(time.time()),))
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return count
+
+
+# --- POINTS SEARCH INDEX ---
+def _init_fts(conn):
+    """Creates the points index, filling it from existing drafts the first time."""
+    try:
+        conn.executescript(FTS_SCHEMA)
+    except sqlite3.OperationalError:
+        return False
+    if not conn.execute("SELECT 1 FROM meta WHERE key = 'fts_built'").fetchone():
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM points_fts")
+            for row in conn.execute("SELECT id, data FROM drafts").fetchall():
+                ops = [json.loads(r[0]) for r in conn.execute("SELECT op FROM journal WHERE draft_id = ? ORDER BY id", (row[0],))]
+                _index_points(conn, row[0], apply_ops(json.loads(row[1]), ops).get("points", []))
+            conn.execute("INSERT INTO meta (key, value) VALUES ('fts_built', ?)", (str(time.time()),))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    return True
+
+
+def _index_points(conn, draft_id, points, start=0):
+    """Replaces the draft's indexed points (or appends after point ``start`` when > 0)."""
+    if start == 0:
+        conn.execute("DELETE FROM points_fts WHERE draft_id = ?", (draft_id,))
+    conn.executemany(
+        "INSERT INTO points_fts (draft_id, point_no, topic, discussion) VALUES (?, ?, ?, ?)",
+        [(draft_id, start + i, p.get("topic", ""), p.get("discussion", "")) for i, p in enumerate(points, start=1)],
+    )
+
+
+class DraftConflict(Exception):
+    """The draft changed since this session last read it."""
+
+    def __init__(self, draft_id, expected, actual):
+        super().__init__(f"Draft {draft_id} is at version {actual}, expected {expected}")
+        self.draft_id = draft_id
+        self.expected = expected
+        self.actual = actual
+
+
+def _check_version(conn, draft_id, expected_version):
+    row = conn.execute("SELECT version FROM drafts WHERE id = ?", (draft_id,)).fetchone()
+    if row is None:
+        return None
+    if expected_version is not None and row[0] != expected_version:
+        raise DraftConflict(draft_id, expected_version, row[0])
+    return row[0]
+
+
+def save(data, draft_id=None, expected_version=None, db_path=DB_PATH):
+    """Inserts a new draft, or replaces ``draft_id`` if it is still at ``expected_version``.
+
+    Returns ``(draft_id, version)``; raises DraftConflict when another session
+    saved in between. ``expected_version=None`` overwrites unconditionally.
+    """
+    conn = connect(db_path)
+    now = time.time()
+    blob = json.dumps(data)
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        current = _check_version(conn, draft_id, expected_version) if draft_id is not None else None
+        if current is not None:
+            conn.execute(
+                "UPDATE drafts SET draft_date = ?, updated_at = ?, data = ?, version = ? WHERE id = ?",
+                (data["date"], now, blob, current + 1, draft_id),
+            )
+            # A full save supersedes any journalled deltas.
+            conn.execute("DELETE FROM journal WHERE draft_id = ?", (draft_id,))
+            result = (draft_id, current + 1)
+        else:
+            cur = conn.execute(
+                "INSERT INTO drafts (draft_date, created_at, updated_at, data, version) VALUES (?, ?, ?, ?, 1)",
+                (data["date"], now, now, blob),
+            )
+            result = (cur.lastrowid, 1)
+        if _fts_ready.get(db_path):
+            _index_points(conn, result[0], data.get("points", []))
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return result
+
+
+def load(draft_id, db_path=DB_PATH):
+    """The draft document with its journal replayed on top."""
+    conn = connect(db_path)
+    row = conn.execute("SELECT id, data, version FROM drafts WHERE id = ?", (draft_id,)).fetchone()
+    if row is None:
+        return None
+    try:
+        data = json.loads(row["data"])
+    except ValueError:
+        return None
+    ops = [json.loads(r[0]) for r in conn.execute("SELECT op FROM journal WHERE draft_id = ? ORDER BY id", (draft_id,))]
+    data = apply_ops(data, ops)
+    data["id"] = row["id"]
+    data["version"] = row["version"]
+    return data
+
+
+# --- DELTA JOURNAL ---
+# Ops are small JSON objects:
+#   {"op": "set", "field": "time" | "date" | "year" | "department", "value": ...}
+#   {"op": "attendance", "add": [names], "remove": [names]}
+#   {"op": "points_add", "points": [{"topic", "discussion"}, ...]}
+#   {"op": "points_set", "points": [...]}      (anything other than appending)
+def diff_ops(old, new):
+    """Ops turning draft document ``old`` into ``new``."""
+    ops = []
+    for field in ("date", "time", "year", "department"):
+        if old.get(field) != new.get(field):
+            ops.append({"op": "set", "field": field, "value": new.get(field)})
+    old_att, new_att = set(old.get("attendance", [])), set(new.get("attendance", []))
+    if old_att != new_att:
+        ops.append({
+            "op": "attendance",
+            "add": [n for n in new.get("attendance", []) if n not in old_att],
+            "remove": sorted(old_att - new_att),
+        })
+    old_pts, new_pts = old.get("points", []), new.get("points", [])
+    if old_pts != new_pts:
+        if new_pts[:len(old_pts)] == old_pts:
+            ops.append({"op": "points_add", "points": new_pts[len(old_pts):]})
+        else:
+            ops.append({"op": "points_set", "points": new_pts})
+    return ops
+
+
+def apply_ops(data, ops):
+    if not ops:
+        return data
+    attendance = dict.fromkeys(data.get("attendance", []))
+    points = list(data.get("points", []))
+    for op in ops:
+        kind = op["op"]
+        if kind == "set":
+            data[op["field"]] = op["value"]
+        elif kind == "attendance":
+            for name in op["remove"]:
+                attendance.pop(name, None)
+            attendance.update(dict.fromkeys(op["add"]))
+        elif kind == "points_add":
+            points.extend(op["points"])
+        elif kind == "points_set":
+            points = list(op["points"])
+    data["attendance"] = list(attendance)
+    data["points"] = points
+    return data
+
+
+def append_ops(draft_id, ops, expected_version=None, db_path=DB_PATH):
+    """Journals ``ops`` for ``draft_id`` in one transaction and returns the new version.
+
+    Same compare-and-swap rule as ``save``; compacts when the journal is long.
+    """
+    conn = connect(db_path)
+    now = time.time()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        version = _check_version(conn, draft_id, expected_version)
+        if version is None:
+            raise KeyError(draft_id)
+        if not ops:
+            conn.execute("COMMIT")
+            return version
+        version += 1
+        conn.executemany(
+            "INSERT INTO journal (draft_id, created_at, op) VALUES (?, ?, ?)",
+            [(draft_id, now, json.dumps(op)) for op in ops],
+        )
+        if _fts_ready.get(db_path):
+            for op in ops:
+                if op["op"] == "points_set":
+                    _index_points(conn, draft_id, op["points"])
+                elif op["op"] == "points_add":
+                    indexed = conn.execute("SELECT COUNT(*) FROM points_fts WHERE draft_id = ?", (draft_id,)).fetchone()[0]
+                    _index_points(conn, draft_id, op["points"], start=indexed)
+        date_ops = [op["value"] for op in ops if op["op"] == "set" and op["field"] == "date"]
+        if date_ops:
+            conn.execute("UPDATE drafts SET draft_date = ?, updated_at = ?, version = ? WHERE id = ?", (date_ops[-1], now, version, draft_id))
+        else:
+            conn.execute("UPDATE drafts SET updated_at = ?, version = ? WHERE id = ?", (now, version, draft_id))
+        pending = conn.execute("SELECT COUNT(*) FROM journal WHERE draft_id = ?", (draft_id,)).fetchone()[0]
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    if pending >= COMPACT_EVERY:
+        compact(draft_id, db_path)
+    return version
+
+
+def compact(draft_id, db_path=DB_PATH):
+    """Folds the journal into the draft document and clears it."""
+    conn = connect(db_path)
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        row = conn.execute("SELECT data FROM drafts WHERE id = ?", (draft_id,)).fetchone()
+        if row is not None:
+            ops = [json.loads(r[0]) for r in conn.execute("SELECT op FROM journal WHERE draft_id = ? ORDER BY id", (draft_id,))]
+            data = apply_ops(json.loads(row[0]), ops)
+            conn.execute("UPDATE drafts SET data = ? WHERE id = ?", (json.dumps(data), draft_id))
+        conn.execute("DELETE FROM journal WHERE draft_id = ?", (draft_id,))
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def list_drafts(limit=None, db_path=DB_PATH):
+    """[(id, date, updated_at)] newest date first."""
+    sql = "SELECT id, draft_date, updated_at FROM drafts ORDER BY draft_date DESC, updated_at DESC"
+    if limit:
+        sql += f" LIMIT {int(limit)}"
+    return [tuple(r) for r in connect(db_path).execute(sql)]
+
+
+def delete(draft_id, db_path=DB_PATH):
+    """Removes a draft with its journal, lease and indexed points; False if it was already gone."""
+    conn = connect(db_path)
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute("DELETE FROM journal WHERE draft_id = ?", (draft_id,))
+        conn.execute("DELETE FROM leases WHERE draft_id = ?", (draft_id,))
+        if _fts_ready.get(db_path):
+            conn.execute("DELETE FROM points_fts WHERE draft_id = ?", (draft_id,))
+        deleted = conn.execute("DELETE FROM drafts WHERE id = ?", (draft_id,)).rowcount > 0
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return deleted
+
+
+# --- SEARCH ---
+_QUERY_TERMS = re.compile(r'"[^"]*"|\S+')
+
+
+def _fts_query(text):
+    """Builds an FTS5 expression from what a user types.
+
+    Words must all match, "quoted phrases" match as phrases and OR between terms
+    is kept; the last word also matches as a prefix, so results show up while typing.
+    """
+    terms = []
+    for term in _QUERY_TERMS.findall(text):
+        if term == "OR":
+            if terms and terms[-1] != "OR":
+                terms.append(term)
+            continue
+        words = term.strip('"').replace('"', " ").split()
+        if words:
+            terms.append('"' + " ".join(words) + '"')
+    if terms and terms[-1] == "OR":
+        terms.pop()
+    if terms and not text.rstrip().endswith('"'):
+        terms[-1] += "*"
+    return " ".join(terms)
+
+
+def search_points(text, limit=20, db_path=DB_PATH):
+    """Best-matching discussion points across all drafts, topics weighted double.
+
+    Returns [(draft_id, date, point_no, topic, snippet)] with matches wrapped in
+    ``**``; empty when the query is blank or SQLite was built without FTS5.
+    """
+    conn = connect(db_path)
+    query = _fts_query(text)
+    if not query or not _fts_ready.get(db_path):
+        return []
+    sql = """
+        SELECT f.draft_id, d.draft_date, f.point_no,
+               highlight(points_fts, 2, '**', '**'),
+               snippet(points_fts, 3, '**', '**', '…', 16)
+        FROM points_fts f JOIN drafts d ON d.id = f.draft_id
+        WHERE points_fts MATCH ?
+        ORDER BY bm25(points_fts, 0, 0, 2.0, 1.0), d.draft_date DESC
+        LIMIT ?
+    """
+    try:
+        return [tuple(r) for r in conn.execute(sql, (query, int(limit)))]
+    except sqlite3.OperationalError:
+        # Whatever survives quoting can still be an invalid expression ("a OR OR b").
+        return []
+
+
+# --- EDIT LEASES ---
+LEASE_SECONDS = 90
+
+
+def acquire_lease(draft_id, holder, holder_name="", ttl=LEASE_SECONDS, db_path=DB_PATH):
+    """Takes or renews the edit lease on ``draft_id``.
+
+    Returns None when ``holder`` now holds it, else ``(holder_name, expires_at)``
+    of the session that does. Leases are advisory: they tell people who else is
+    editing, while the version check is what prevents lost updates.
+    """
+    conn = connect(db_path)
+    now = time.time()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        row = conn.execute("SELECT holder, holder_name, expires_at FROM leases WHERE draft_id = ?", (draft_id,)).fetchone()
+        if row is not None and row["holder"] != holder and row["expires_at"] > now:
+            conn.execute("COMMIT")
+            return (row["holder_name"] or "Another coordinator", row["expires_at"])
+        conn.execute(
+            "INSERT OR REPLACE INTO leases (draft_id, holder, holder_name, expires_at) VALUES (?, ?, ?, ?)",
+            (draft_id, holder, holder_name, now + ttl),
+        )
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return None
+
+
+def release_lease(draft_id, holder, db_path=DB_PATH):
+    connect(db_path).execute("DELETE FROM leases WHERE draft_id = ? AND holder = ?", (draft_id, holder))
@@ -0,0 +1,107 @@
+"""Regenerate DOCX/PDF minutes for many saved drafts at once, without the UI.
+
+    python generate_reports.py --from 2026-01-01 --to 2026-06-30 --out reports/
+    python generate_reports.py --ids 3,7,12 --kinds pdf
+    python generate_reports.py --list
+
+Drafts are resolved against the current roster (MOM_ROSTER) exactly as the app
+does, then rendered across a process pool.
+"""
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import draft_store
+import report_engine
+import roster_store
+
+
+def select_drafts(args):
+    """(id, date) pairs matching the command line, oldest first."""
+    drafts = [(d_id, d_date) for d_id, d_date, _ in draft_store.list_drafts()]
+    if args.ids:
+        wanted = {int(x) for x in args.ids.split(",")}
+        drafts = [d for d in drafts if d[0] in wanted]
+    if args.date_from:
+        drafts = [d for d in drafts if d[1] >= args.date_from]
+    if args.date_to:
+        drafts = [d for d in drafts if d[1] <= args.date_to]
+    return sorted(drafts, key=lambda d: (d[1], d[0]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--from", dest="date_from", help="first meeting date (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="date_to", help="last meeting date (YYYY-MM-DD)")
+    parser.add_argument("--ids", help="comma-separated draft ids")
+    parser.add_argument("--kinds", default="docx,pdf")
+    parser.add_argument("--out", default="reports")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--list", action="store_true", help="list matching drafts and exit")
+    args = parser.parse_args()
+
+    kinds = [k for k in args.kinds.split(",") if k]
+    unknown = [k for k in kinds if k not in report_engine.KINDS]
+    if unknown:
+        parser.error(f"unknown kind(s): {', '.join(unknown)}")
+
+    drafts = select_drafts(args)
+    if args.list:
+        for d_id, d_date in drafts:
+            print(f"{d_id:>6}  {d_date}")
+        return 0
+    if not drafts:
+        print("No drafts match.")
+        return 0
+
+    roster = roster_store.get_roster()
+    os.makedirs(args.out, exist_ok=True)
+    # Several drafts on one date get the draft id in the file name so none overwrite each other.
+    per_date = Counter(d_date for _, d_date in drafts)
+
+    t0 = time.perf_counter()
+    total = len(drafts)
+    done = failed = 0
+
+    def report_failure(d_id, d_date, e):
+        nonlocal done, failed
+        done += 1
+        failed += 1
+        print(f"[{done}/{total}] {d_date} (#{d_id}) FAILED: {e}", file=sys.stderr)
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = {}
+        for d_id, d_date in drafts:
+            # A draft that can't be read or turned into a meeting fails on its own,
+            # like a render error, without stopping the others.
+            try:
+                draft = draft_store.load(d_id)
+                if draft is None:
+                    raise ValueError("draft is missing or unreadable")
+                meeting = report_engine.meeting_from_draft(draft, roster)
+            except Exception as e:
+                report_failure(d_id, d_date, e)
+                continue
+            stem = f"SM_MOM_{d_date}_{d_id}" if per_date[d_date] > 1 else None
+            futures[pool.submit(report_engine.render_to_files, meeting, kinds, args.out, stem)] = (d_id, d_date)
+
+        for future in as_completed(futures):
+            d_id, d_date = futures[future]
+            try:
+                paths = future.result()
+            except Exception as e:
+                report_failure(d_id, d_date, e)
+                continue
+            done += 1
+            print(f"[{done}/{total}] {d_date} (#{d_id}) -> {', '.join(os.path.basename(p) for p in paths)}")
+
+    print(f"Rendered {total - failed} meeting(s) to {args.out}/ in {time.perf_counter() - t0:.1f}s"
+          + (f", {failed} failed" if failed else ""))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
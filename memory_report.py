@@ -0,0 +1,54 @@
+"""Approximate bytes held by the shared roster and by one session's state."""
+import sys
+
+import numpy as np
+import pandas as pd
+
+from attendance import AttendanceSet
+from roster_store import RosterSnapshot
+
+
+def deep_size(obj, seen=None):
+    """Bytes reachable from ``obj``, not counting the shared roster snapshot."""
+    seen = set() if seen is None else seen
+    if id(obj) in seen or isinstance(obj, RosterSnapshot):
+        return 0
+    seen.add(id(obj))
+    if isinstance(obj, np.ndarray):
+        return sys.getsizeof(obj) if obj.base is None else obj.nbytes
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        return int(obj.memory_usage(deep=True).sum()) if isinstance(obj, pd.DataFrame) else int(obj.memory_usage(deep=True))
+    if isinstance(obj, AttendanceSet):
+        return sys.getsizeof(obj) + deep_size(obj.rows, seen)
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_size(k, seen) + deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_size(v, seen) for v in obj)
+    return size
+
+
+def snapshot_bytes(snapshot):
+    """{part: bytes} for the process-wide snapshot; derived indexes only once built."""
+    parts = {"frame": int(snapshot.df.memory_usage(deep=True).sum())}
+    built = snapshot.__dict__
+    if "index" in built:
+        idx = built["index"]
+        parts["index"] = (
+            idx.names.nbytes + idx.order.nbytes + idx.rank.nbytes
+            + sum(g.nbytes for g in idx.groups.values()) + sys.getsizeof(idx.row_of)
+        )
+    if "search" in built:
+        search = built["search"]
+        parts["search"] = (
+            sum(p.nbytes for p in search.postings.values()) + sys.getsizeof(search.postings)
+            + sum(sys.getsizeof(k) for k in search.keys) + sys.getsizeof(search.tokens)
+            + search.token_rows.nbytes
+        )
+    return parts
+
+
+def session_bytes(session_state):
+    """[(key, bytes)] for one session's state, largest first."""
+    sizes = [(str(k), deep_size(v)) for k, v in session_state.items()]
+    return sorted(sizes, key=lambda kv: kv[1], reverse=True)
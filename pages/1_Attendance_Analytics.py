@@ -0,0 +1,72 @@
+import streamlit as st
+import time
+import analytics
+import roster_store
+
+# --- PAGE CONFIG ---
+st.set_page_config(
+    page_title="SM MOM · Analytics",
+    page_icon="Logo/Picsart_23-05-18_16-47-20-287-removebg-preview.png",
+    layout="wide",
+)
+
+@st.cache_resource
+def get_analytics():
+    # One engine per server process: parsed drafts are shared across sessions
+    # and only new or edited drafts are re-read on each view.
+    return analytics.AttendanceAnalytics()
+
+st.title("📊 Attendance Analytics")
+
+try:
+    roster = roster_store.get_roster()
+except Exception:
+    roster = None
+if roster is None or roster.df.empty:
+    st.error("Could not load 'students.xlsx'. Please check if the file exists.")
+    st.stop()
+
+with st.sidebar:
+    threshold = st.slider("Defaulter threshold (%)", 0, 100, int(analytics.DEFAULTER_THRESHOLD), step=5)
+    min_meetings = st.number_input("Minimum meetings", min_value=1, value=analytics.MIN_MEETINGS, step=1)
+
+t0 = time.perf_counter()
+report = get_analytics().report(roster, threshold=float(threshold), min_meetings=int(min_meetings))
+elapsed = time.perf_counter() - t0
+
+meetings = report["meetings"]
+students = report["students"]
+if meetings.empty:
+    st.info("No saved drafts yet. Save a meeting draft to start collecting attendance history.")
+    st.stop()
+
+tracked = students[students["Eligible"] > 0]
+c1, c2, c3, c4 = st.columns(4)
+c1.metric("Meetings", len(meetings))
+c2.metric("Students tracked", len(tracked))
+c3.metric("Overall attendance", f"{100.0 * tracked['Attended'].sum() / max(1, tracked['Eligible'].sum()):.1f}%")
+c4.metric("Defaulters", len(report["defaulters"]))
+st.caption(f"Computed in {elapsed * 1000:.0f} ms")
+
+# --- PARTICIPATION ---
+st.subheader("Attendance per Meeting")
+st.bar_chart(meetings.set_index(meetings["Date"] + " " + meetings["Time"])[["Present", "Expected"]], stack=False)
+
+col_dept, col_year = st.columns(2)
+with col_dept:
+    st.subheader("By Department")
+    st.dataframe(report["departments"], width="stretch")
+with col_year:
+    st.subheader("By Year")
+    st.dataframe(report["years"], width="stretch")
+
+# --- STUDENTS ---
+st.subheader(f"Defaulters (below {threshold}% over at least {int(min_meetings)} meetings)")
+st.dataframe(report["defaulters"], hide_index=True, width="stretch")
+
+st.subheader("All Students")
+query = st.text_input("Filter by name", placeholder="Type a name...")
+view = tracked
+if query:
+    view = view[view["NAME"].str.contains(query, case=False, regex=False)]
+st.dataframe(view.sort_values(["Attendance %", "NAME"]), hide_index=True, width="stretch")
@@ -0,0 +1,124 @@
+"""The FPDF document class for reports, fed from per-process asset caches.
+
+Stock pyfpdf 1.7 re-reads its assets for every document: ``add_font(uni=True)``
+loads the font's metrics (from a .pkl that pins the .ttf's absolute path and
+never notices the file changing), ``output`` parses the whole font again to
+embed a subset of it, and ``image`` decodes PNGs in pure Python. ``ReportPDF``
+takes all three from caches kept per process and keyed by each file's path,
+mtime and size (``report_assets.load``), so a report only lays out its text and
+writes its objects.
+
+This module is the one place that relies on pyfpdf internals: the ``fonts`` and
+``font_files`` entries ``add_font`` makes, ``_parsepng``, ``_putTTfontwidths``
+and the ``TTFontFile`` name ``_putfonts`` resolves. The fpdf module itself is
+never modified.
+"""
+import os
+import re
+import threading
+import types
+from collections import OrderedDict
+
+from fpdf import FPDF
+from fpdf.ttfonts import TTFontFile
+
+import report_assets
+
+SUBSET_CACHE_SIZE = 32  # embedded subsets kept per font, keyed by the set of characters used
+
+
+class PdfFont:
+    """A TrueType font parsed once: its metrics, widths and the subsets already embedded."""
+
+    def __init__(self, path):
+        ttf = TTFontFile()
+        ttf.getMetrics(path)
+        self.path = path
+        self.name = re.sub("[ ()]", "", ttf.fullName)
+        self.desc = {
+            "Ascent": int(round(ttf.ascent)),
+            "Descent": int(round(ttf.descent)),
+            "CapHeight": int(round(ttf.capHeight)),
+            "Flags": ttf.flags,
+            "FontBBox": "[%s %s %s %s]" % tuple(int(round(v)) for v in ttf.bbox),
+            "ItalicAngle": int(ttf.italicAngle),
+            "StemV": int(round(ttf.stemV)),
+            "MissingWidth": int(round(ttf.defaultWidth)),
+        }
+        self.up = round(ttf.underlinePosition)
+        self.ut = round(ttf.underlineThickness)
+        self.widths = ttf.charWidths  # shared, read-only
+        self.size = os.path.getsize(path)
+        self._subsets = OrderedDict()  # frozenset of codes -> (font program, codeToGlyph, maxUni)
+        self._lock = threading.Lock()
+
+    def subset(self, codes):
+        """(font program, codeToGlyph, maxUni) embedding just ``codes``."""
+        key = frozenset(codes)
+        with self._lock:
+            hit = self._subsets.get(key)
+            if hit is not None:
+                self._subsets.move_to_end(key)
+                return hit
+        ttf = TTFontFile()
+        stream = ttf.makeSubset(self.path, sorted(key))
+        hit = (stream, ttf.codeToGlyph, ttf.maxUni)
+        with self._lock:
+            self._subsets[key] = hit
+            while len(self._subsets) > SUBSET_CACHE_SIZE:
+                self._subsets.popitem(last=False)
+        return hit
+
+
+class _CachedSubsetFontFile(TTFontFile):
+    """What ``ReportPDF._putfonts`` sees as TTFontFile: subsets come from the font cache."""
+
+    def makeSubset(self, file, subset):
+        font = report_assets.load(file, PdfFont)
+        if font is None:
+            return TTFontFile.makeSubset(self, file, subset)
+        stream, self.codeToGlyph, self.maxUni = font.subset(subset)
+        return stream
+
+
+def _png_info(path):
+    return FPDF()._parsepng(path)
+
+
+class ReportPDF(FPDF):
+    def add_font(self, family, style="", fname="", uni=False):
+        """``add_font(uni=True)`` from the font cache; anything else is left to FPDF."""
+        font = report_assets.load(fname, PdfFont) if uni else None
+        if font is None:
+            return super().add_font(family, style, fname, uni)
+        style = style.upper()
+        fontkey = family.lower() + ("BI" if style == "IB" else style)
+        if fontkey in self.fonts:
+            return
+        # The entries stock add_font makes; keep the digits if the page-count alias may be substituted.
+        first = range(0, 57) if hasattr(self, "str_alias_nb_pages") else range(0, 32)
+        self.fonts[fontkey] = {
+            "i": len(self.fonts) + 1, "type": "TTF", "name": font.name, "desc": font.desc,
+            "up": font.up, "ut": font.ut, "cw": font.widths, "ttffile": font.path,
+            "fontkey": fontkey, "subset": list(first), "unifilename": None,
+        }
+        self.font_files[fontkey] = {"length1": font.size, "type": "TTF", "ttffile": font.path}
+
+    # FPDF's own _putfonts, run with TTFontFile resolved to the caching subclass.
+    _putfonts = types.FunctionType(
+        FPDF._putfonts.__code__,
+        dict(FPDF._putfonts.__globals__, TTFontFile=_CachedSubsetFontFile),
+        "_putfonts",
+    )
+
+    def _putTTfontwidths(self, font, maxUni):
+        # FPDF tests every code point up to maxUni against the list of characters
+        # drawn (one entry per character), which is quadratic in document length.
+        super()._putTTfontwidths(dict(font, subset=set(font["subset"])), maxUni)
+
+    def _parsepng(self, name):
+        # FPDF splits alpha channels per pixel in pure Python; do that once per file version.
+        info = report_assets.load(name, _png_info)
+        if info is None:
+            return super()._parsepng(name)
+        return dict(info)  # image() and _putimages() write into it
@@ -0,0 +1,120 @@
+"""Row-at-a-time table rendering for FPDF with explicit page breaks.
+
+FPDF's own auto page break fires in the middle of a row and knows nothing about
+table headers, and ``multi_cell`` re-measures text while it draws. Here every
+row is measured once up front, the page is broken *before* a row that would not
+fit, and the table header is redrawn at the top of each new page. Rows are
+consumed from iterables, so nothing beyond FPDF's own page buffer is held.
+"""
+
+FILL_GREY = (240, 240, 240)
+
+
+def wrap_text(pdf, text, width):
+    """Splits ``text`` into lines that fit ``width`` mm in the current font (like multi_cell)."""
+    max_w = width - 2 * pdf.c_margin
+    space_w = pdf.get_string_width(" ")
+    lines = []
+    for paragraph in text.split("\n"):
+        line, line_w = "", 0.0
+        for word in paragraph.split(" "):
+            word_w = pdf.get_string_width(word)
+            if line and line_w + space_w + word_w <= max_w:
+                line, line_w = f"{line} {word}", line_w + space_w + word_w
+                continue
+            if line:
+                lines.append(line)
+            # Hard-split words that are wider than the cell on their own
+            while word_w > max_w and len(word) > 1:
+                cut = len(word) - 1
+                while cut > 1 and pdf.get_string_width(word[:cut]) > max_w:
+                    cut -= 1
+                lines.append(word[:cut])
+                word = word[cut:]
+                word_w = pdf.get_string_width(word)
+            line, line_w = word, word_w
+        lines.append(line)
+    return lines
+
+
+class PdfTable:
+    """A bordered table whose rows never straddle a page break."""
+
+    def __init__(self, pdf, widths, header=None, font=("Arial", "", 11), header_font=("Arial", "B", 11), fill=FILL_GREY):
+        self.pdf = pdf
+        self.widths = widths
+        self.header = header
+        self.font = font
+        self.header_font = header_font
+        self.fill = fill
+        # Breaks are managed per row; FPDF must not split a row on its own.
+        self._auto_break = pdf.auto_page_break
+        pdf.set_auto_page_break(False, pdf.b_margin)
+
+    def close(self):
+        self.pdf.set_auto_page_break(self._auto_break, self.pdf.b_margin)
+
+    def __enter__(self):
+        if self.header:
+            self.ensure_room(2 * 10)
+            self.draw_header()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def room_left(self):
+        return self.pdf.page_break_trigger - self.pdf.get_y()
+
+    def ensure_room(self, height):
+        """Starts a new page (with the header) if ``height`` mm won't fit on this one."""
+        if height > self.room_left():
+            self.pdf.add_page()
+            if self.header:
+                self.draw_header()
+            return True
+        return False
+
+    def draw_header(self, height=10):
+        pdf = self.pdf
+        pdf.set_font(*self.header_font)
+        pdf.set_fill_color(*self.fill)
+        last = len(self.header) - 1
+        for i, (w, text) in enumerate(zip(self.widths, self.header)):
+            pdf.cell(w, height, text, 1, 1 if i == last else 0, 'C', 1)
+        pdf.set_font(*self.font)
+
+    def rows(self, rows, aligns, height=10):
+        """Single-line rows: ``rows`` yields one tuple of cell strings per row."""
+        pdf = self.pdf
+        pdf.set_font(*self.font)
+        last = len(self.widths) - 1
+        for values in rows:
+            self.ensure_room(height)
+            for i, (w, text, align) in enumerate(zip(self.widths, values, aligns)):
+                pdf.cell(w, height, text, 1, 1 if i == last else 0, align)
+
+    def label_row(self, label, text, line_height=6, min_height=10, label_font=None):
+        """A shaded label cell beside wrapped text; long text continues on the next page."""
+        pdf = self.pdf
+        label_w, text_w = self.widths
+        pdf.set_font(*self.font)
+        lines = wrap_text(pdf, text, text_w)
+        while lines:
+            self.ensure_room(min_height)
+            fit = max(1, int(self.room_left() // line_height))
+            chunk, lines = lines[:fit], lines[fit:]
+            height = max(min_height, len(chunk) * line_height)
+            x, y = pdf.get_x(), pdf.get_y()
+
+            pdf.set_font(*(label_font or self.header_font))
+            pdf.set_fill_color(*self.fill)
+            pdf.cell(label_w, height, label, 1, 0, 'L', 1)
+
+            pdf.set_font(*self.font)
+            pdf.rect(x + label_w, y, text_w, height)
+            text_y = y + (height - len(chunk) * line_height) / 2
+            for n, line in enumerate(chunk):
+                pdf.set_xy(x + label_w, text_y + n * line_height)
+                pdf.cell(text_w, line_height, line, 0, 0, 'L')
+            pdf.set_xy(x, y + height)
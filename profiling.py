@@ -0,0 +1,141 @@
+"""Timed spans and counters for one run of a Streamlit script.
+
+Index.py calls ``start()`` at the top of every rerun, marks its top-level
+sections with ``section()``, wraps finer work in ``span()`` and bumps
+``count()`` for widgets and rows. ``finish()`` closes the run and returns a
+plain dict, which is appended as one JSON line to ``MOM_PROFILE_LOG`` when that
+is set. Fragments use ``scope()``: a section of the full run, or a run of their
+own when they rerun alone. Recording is a couple of perf_counter() calls per
+span, so it is always on; only the export and the debug panel are opt-in.
+"""
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+LOG_PATH = os.environ.get("MOM_PROFILE_LOG")
+
+_current = contextvars.ContextVar("profile_run", default=None)
+_log_lock = threading.Lock()
+
+
+class Run:
+    def __init__(self, label=""):
+        self.label = label
+        self.started = time.time()
+        self.t0 = time.perf_counter()
+        self.spans = []      # [name, depth, start ms, duration ms]
+        self.counters = {}
+        self.depth = 0
+        self.section = None  # index into spans of the open top-level section
+
+    def now_ms(self):
+        return (time.perf_counter() - self.t0) * 1000.0
+
+    def open(self, name):
+        self.spans.append([name, self.depth, self.now_ms(), None])
+        self.depth += 1
+        return len(self.spans) - 1
+
+    def close(self, i):
+        span = self.spans[i]
+        span[3] = self.now_ms() - span[2]
+        self.depth = span[1]
+
+    def close_section(self):
+        if self.section is not None:
+            self.close(self.section)
+            self.section = None
+
+    def record(self):
+        return {
+            "ts": self.started,
+            "label": self.label,
+            "total_ms": round(self.now_ms(), 3),
+            "spans": [
+                {"name": n, "depth": d, "start_ms": round(s, 3), "ms": round(ms, 3) if ms is not None else None}
+                for n, d, s, ms in self.spans
+            ],
+            "counters": dict(self.counters),
+        }
+
+
+def start(label=""):
+    """Begins recording a new run in this thread, dropping any unfinished one."""
+    run = Run(label)
+    _current.set(run)
+    return run
+
+
+def section(name):
+    """Ends the previous top-level section and starts ``name`` (for flat scripts)."""
+    run = _current.get()
+    if run is None:
+        return
+    run.close_section()
+    run.depth = 0
+    run.section = run.open(name)
+
+
+@contextmanager
+def span(name):
+    run = _current.get()
+    if run is None:
+        yield
+        return
+    i = run.open(name)
+    try:
+        yield
+    finally:
+        run.close(i)
+
+
+def add_span(name, seconds):
+    """Records work timed elsewhere (e.g. a report rendered in a worker process)."""
+    run = _current.get()
+    if run is not None:
+        run.spans.append([name, run.depth, run.now_ms(), seconds * 1000.0])
+
+
+def count(name, n=1):
+    run = _current.get()
+    if run is not None:
+        run.counters[name] = run.counters.get(name, 0) + n
+
+
+def finish(history=None, keep=50):
+    """Closes the current run and returns its record (None if nothing was recording).
+
+    The record is also appended to ``history`` (trimmed to ``keep`` entries) if given.
+    """
+    run = _current.get()
+    if run is None:
+        return None
+    _current.set(None)
+    run.close_section()
+    rec = run.record()
+    if history is not None:
+        history.append(rec)
+        del history[:-keep]
+    if LOG_PATH:
+        line = json.dumps(rec, default=str)
+        with _log_lock, open(LOG_PATH, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+    return rec
+
+
+@contextmanager
+def scope(name, label="", history=None):
+    """``section(name)`` inside a full run; otherwise records a run of its own."""
+    if _current.get() is not None:
+        section(name)
+        yield
+        return
+    start(label)
+    section(name)
+    try:
+        yield
+    finally:
+        finish(history)
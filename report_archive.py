@@ -0,0 +1,35 @@
+"""Optional content-addressed archive for rendered reports.
+
+Disabled unless MOM_REPORT_ARCHIVE points at a directory. Outputs are stored as
+``<dir>/<sha256[:2]>/<sha256>.<kind>`` so identical reports share one file and
+concurrent sessions never overwrite each other.
+"""
+import hashlib
+import os
+import threading
+
+ARCHIVE_DIR = os.environ.get("MOM_REPORT_ARCHIVE", "")
+
+
+def enabled():
+    return bool(ARCHIVE_DIR)
+
+
+def path_for(data, kind):
+    digest = hashlib.sha256(data).hexdigest()
+    return os.path.join(ARCHIVE_DIR, digest[:2], f"{digest}.{kind}")
+
+
+def store(data, kind):
+    """Writes ``data`` once under its content hash and returns the path (None when disabled)."""
+    if not enabled():
+        return None
+    path = path_for(data, kind)
+    if os.path.exists(path):
+        return path
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+    return path
@@ -0,0 +1,100 @@
+"""Template, logo and font assets, loaded once per process and reloaded when the files change."""
+import copy
+import io
+import os
+import threading
+
+# python-docx and fpdf are imported where they're used, so the app can hash
+# asset versions (and serve cached reports) without loading the report stack.
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+TEMPLATE_PATH = os.path.join(BASE_DIR, "template.docx")
+BRAND_LOGO_PATH = os.path.join(BASE_DIR, "Logo", "Brand_logo.png")
+SM_LOGO_PATH = os.path.join(BASE_DIR, "Logo", "Picsart_23-05-18_16-47-20-287-removebg-preview.png")
+FONT_DIR = os.path.join(BASE_DIR, "fonts")
+PDF_FONT_FAMILY = "DejaVu"
+PDF_FONT_PATHS = {
+    "": os.path.join(FONT_DIR, "DejaVuSans.ttf"),
+    "B": os.path.join(FONT_DIR, "DejaVuSans-Bold.ttf"),
+}
+
+_lock = threading.Lock()
+_cache = {}  # (path, loader) -> (stat key, loaded value)
+
+
+def _stat_key(path):
+    try:
+        st_ = os.stat(path)
+    except OSError:
+        return None
+    return (st_.st_mtime_ns, st_.st_size)
+
+
+def load(path, loader):
+    """``loader(path)``, kept until the file's mtime or size changes (None if it is missing)."""
+    key = _stat_key(path)
+    with _lock:
+        hit = _cache.get((path, loader))
+    if hit is not None and hit[0] == key:
+        return hit[1]
+    value = loader(path) if key is not None else None
+    with _lock:
+        _cache[(path, loader)] = (key, value)
+    return value
+
+
+def versions():
+    """(mtime, size) of every asset; part of the report cache key."""
+    paths = (TEMPLATE_PATH, BRAND_LOGO_PATH, SM_LOGO_PATH, *PDF_FONT_PATHS.values())
+    return {os.path.basename(p): _stat_key(p) for p in paths}
+
+
+# --- TEMPLATE ---
+def template_document():
+    """A fresh copy of the parsed template.docx (deep-copying skips the unzip and XML parse)."""
+    from docx import Document
+
+    pristine = load(TEMPLATE_PATH, Document)
+    return copy.deepcopy(pristine)
+
+
+# --- LOGOS ---
+class Logo:
+    """A logo read once; its decoded PDF form is cached by pdf_document.ReportPDF."""
+
+    def __init__(self, path):
+        from docx.image.image import Image
+
+        self.path = path
+        with open(path, "rb") as f:
+            self.data = f.read()
+        image = Image.from_blob(self.data)
+        self.aspect = image.px_height / image.px_width
+
+    def add_to_run(self, run, width_in):
+        from docx.shared import Inches
+
+        run.add_picture(io.BytesIO(self.data), width=Inches(width_in), height=Inches(width_in * self.aspect))
+
+    def add_to_pdf(self, pdf, x, y, w):
+        pdf.image(self.path, x, y, w, w * self.aspect)
+
+
+def logo(path):
+    """The cached Logo for ``path``, or None if the file is missing."""
+    return load(path, Logo)
+
+
+# --- PDF FONTS ---
+def add_pdf_fonts(pdf):
+    """Registers the bundled Unicode fonts with ``pdf`` and returns their family.
+
+    With pdf_document.ReportPDF the fonts are parsed once per process; a plain
+    FPDF parses them for every document. Falls back to FPDF's core Arial
+    (Latin-1 only) if a font file is missing.
+    """
+    if not all(os.path.exists(path) for path in PDF_FONT_PATHS.values()):
+        return "Arial"
+    for style, path in PDF_FONT_PATHS.items():
+        pdf.add_font(PDF_FONT_FAMILY, style, path, uni=True)
+    return PDF_FONT_FAMILY
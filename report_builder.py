@@ -0,0 +1,325 @@
+"""DOCX and PDF renderers for a meeting's minutes.
+
+A *meeting* is a plain dict so it can be handed to worker processes::
+
+    {"date": date, "time": str, "years": [...], "departments": [...],
+     "students": [{"NAME", "YEAR", "DEPARTMENT"}, ...],
+     "points": [{"topic", "discussion"}, ...]}
+"""
+import io
+from xml.sax.saxutils import escape
+
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.oxml import parse_xml
+from docx.oxml.ns import qn
+from docx.shared import Inches, Pt, RGBColor
+
+import report_assets
+from pdf_document import ReportPDF
+from pdf_renderer import PdfTable
+
+# --- FAST TABLE EMISSION ---
+# table.add_row().cells walks the whole grid on every call, so large tables are
+# built here as one w:tr fragment, parsed once and appended in bulk. The markup
+# matches what python-docx produces for .text / .alignment / add_run().
+_W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+
+def _grid_widths(table):
+    return [gc.get(qn("w:w")) for gc in table._tbl.tblGrid.gridCol_lst]
+
+
+def _run_xml(text, bold=False, size_half_pts=None):
+    rpr = ""
+    if bold or size_half_pts:
+        rpr = "<w:rPr>" + ("<w:b/>" if bold else "") + (f'<w:sz w:val="{size_half_pts}"/>' if size_half_pts else "") + "</w:rPr>"
+    parts = []
+    for i, line in enumerate(text.split("\n")):
+        if i:
+            parts.append("<w:br/>")
+        for j, chunk in enumerate(line.split("\t")):
+            if j:
+                parts.append("<w:tab/>")
+            if chunk:
+                space = ' xml:space="preserve"' if chunk != chunk.strip() else ""
+                parts.append(f"<w:t{space}>{escape(chunk)}</w:t>")
+    return f"<w:r>{rpr}{''.join(parts)}</w:r>"
+
+
+def _cell_xml(width, paragraph_xml):
+    return f'<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{width}"/></w:tcPr>{paragraph_xml}</w:tc>'
+
+
+def _append_fragment(table, rows_xml):
+    if not rows_xml:
+        return
+    fragment = parse_xml(f'<w:tbl xmlns:w="{_W_NS}">{"".join(rows_xml)}</w:tbl>')
+    table._tbl.extend(list(fragment))
+
+
+def append_rows(table, rows):
+    """Appends plain-text rows; each cell is a (text, centered) pair."""
+    widths = _grid_widths(table)
+    rows_xml = []
+    for row in rows:
+        cells = []
+        for width, (text, centered) in zip(widths, row):
+            ppr = '<w:pPr><w:jc w:val="center"/></w:pPr>' if centered else ""
+            body = _run_xml(text) if text else ""
+            cells.append(_cell_xml(width, f"<w:p>{ppr}{body}</w:p>"))
+        rows_xml.append(f"<w:tr>{''.join(cells)}</w:tr>")
+    _append_fragment(table, rows_xml)
+
+
+def append_run_rows(table, rows, size_half_pts=None):
+    """Appends rows whose cells are lists of (text, bold) runs sharing one font size."""
+    widths = _grid_widths(table)
+    rows_xml = []
+    for row in rows:
+        cells = []
+        for width, runs in zip(widths, row):
+            body = "".join(_run_xml(text, bold, size_half_pts) for text, bold in runs)
+            cells.append(_cell_xml(width, f"<w:p>{body}</w:p>"))
+        rows_xml.append(f"<w:tr>{''.join(cells)}</w:tr>")
+    _append_fragment(table, rows_xml)
+
+
+# --- WORD DOCUMENT ---
+def build_docx(meeting):
+    """Renders the minutes as DOCX bytes."""
+    doc = report_assets.template_document()
+
+    # --- HEADER SECTION (3 Columns: Logo | Text | Logo) ---
+    header_table = doc.add_table(rows=1, cols=3)
+    header_table.autofit = False
+    header_table.columns[0].width = Inches(1.2)
+    header_table.columns[1].width = Inches(4.1)
+    header_table.columns[2].width = Inches(1.2)
+
+    # SWAPPED LOGIC: Logo 2 (College) on Left, Logo 1 (SM) on Right
+    
+    # Left Logo (Now Brand_logo / College)
+    cell_left = header_table.rows[0].cells[0]
+    p_left = cell_left.paragraphs[0]
+    p_left.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    logo2 = report_assets.logo(report_assets.BRAND_LOGO_PATH)
+    if logo2 is not None:
+        run = p_left.add_run()
+        logo2.add_to_run(run, 1.0) # Strictly 1.0 Inch
+
+    # Center Text
+    cell_center = header_table.rows[0].cells[1]
+    p_center = cell_center.paragraphs[0]
+    p_center.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    # Updated Title
+    run_title = p_center.add_run("SERVICE MOTTO VOLUNTEERS")
+    run_title.bold = True
+    run_title.font.size = Pt(16)
+    run_title.font.name = 'Arial'
+    run_title.font.color.rgb = RGBColor(0, 0, 0)
+    p_center.add_run("\n")
+    run_subtitle = p_center.add_run("MINUTES OF MEET")
+    run_subtitle.bold = True
+    run_subtitle.font.size = Pt(14)
+    run_subtitle.font.name = 'Arial'
+    run_subtitle.font.color.rgb = RGBColor(0, 0, 0)
+
+    # Right Logo (Now SM Logo)
+    cell_right = header_table.rows[0].cells[2]
+    p_right = cell_right.paragraphs[0]
+    p_right.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    logo1 = report_assets.logo(report_assets.SM_LOGO_PATH)
+    if logo1 is not None:
+        run = p_right.add_run()
+        logo1.add_to_run(run, 1.0) # Strictly 1.0 Inch
+    
+    # Remove header borders
+    tbl = header_table._element
+    tblPr = tbl.tblPr
+    if tblPr is None:
+        tblPr = parse_xml(r'<w:tblPr xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:tblBorders><w:top w:val="none" w:sz="0" w:space="0" w:color="auto"/><w:left w:val="none" w:sz="0" w:space="0" w:color="auto"/><w:bottom w:val="none" w:sz="0" w:space="0" w:color="auto"/><w:right w:val="none" w:sz="0" w:space="0" w:color="auto"/><w:insideH w:val="none" w:sz="0" w:space="0" w:color="auto"/><w:insideV w:val="none" w:sz="0" w:space="0" w:color="auto"/></w:tblBorders></w:tblPr>')
+        tbl.insert(0, tblPr)
+
+    doc.add_paragraph() 
+
+    # --- MEETING DETAILS ---
+    details_table = doc.add_table(rows=1, cols=2)
+    details_table.autofit = False
+    details_table.columns[0].width = Inches(3.25)
+    details_table.columns[1].width = Inches(3.25)
+    
+    c1 = details_table.rows[0].cells[0]
+    p = c1.paragraphs[0]
+    r = p.add_run(f"DATE: {meeting['date'].strftime('%d-%m-%Y')}")
+    r.bold = True
+    r.font.size = Pt(12)
+    
+    c2 = details_table.rows[0].cells[1]
+    p = c2.paragraphs[0]
+    p.alignment = WD_ALIGN_PARAGRAPH.RIGHT
+    r = p.add_run(f"TIME: {meeting['time']}")
+    r.bold = True
+    r.font.size = Pt(12)
+
+    tbl = details_table._element
+    tblPr = tbl.tblPr
+    if tblPr is None:
+         tblPr = parse_xml(r'<w:tblPr xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:tblBorders><w:top w:val="none" w:sz="0" w:space="0" w:color="auto"/><w:left w:val="none" w:sz="0" w:space="0" w:color="auto"/><w:bottom w:val="none" w:sz="0" w:space="0" w:color="auto"/><w:right w:val="none" w:sz="0" w:space="0" w:color="auto"/><w:insideH w:val="none" w:sz="0" w:space="0" w:color="auto"/><w:insideV w:val="none" w:sz="0" w:space="0" w:color="auto"/></w:tblBorders></w:tblPr>')
+         tbl.insert(0, tblPr)
+    
+    doc.add_paragraph() 
+
+    # --- ATTENDANCE ---
+    table = doc.add_table(rows=1, cols=4)
+    table.style = 'Table Grid'
+    hdr_cells = table.rows[0].cells
+    headers = ["S.NO", "NAME", "YEAR", "DEPARTMENT"]
+    for i, h_text in enumerate(headers):
+        p = hdr_cells[i].paragraphs[0]
+        run = p.add_run(h_text)
+        run.bold = True
+        run.font.size = Pt(11)
+        p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        
+    # All attendee rows are emitted as one XML fragment; see append_rows().
+    append_rows(table, (
+        [(str(i), True), (str(s["NAME"]), False), (str(s.get("YEAR", "")), True), (str(s.get("DEPARTMENT", "")), True)]
+        for i, s in enumerate(meeting["students"], start=1)
+    ))
+
+    doc.add_paragraph() 
+
+    # --- DISCUSSION ---
+    if meeting["points"]:
+        heading = doc.add_paragraph()
+        run = heading.add_run("Discussed in Today's SM Room Meeting:")
+        run.bold = True
+        run.font.size = Pt(12)
+        
+        # Create main discussion table
+        disc_table = doc.add_table(rows=0, cols=2)
+        disc_table.style = 'Table Grid'
+        disc_table.autofit = False
+        disc_table.columns[0].width = Inches(1.5)
+        disc_table.columns[1].width = Inches(5.0)
+        
+        rows = []
+        for i, p in enumerate(meeting["points"], start=1):
+            # Point row: bold label, topic in second column
+            rows.append([
+                [(f"Point : {i}", True)],
+                [(p['topic'], False)],
+            ])
+            # Discussion row: each non-empty line becomes a bullet run
+            rows.append([
+                [("Discussion", True)],
+                [(f"• {line.strip()}\n", False) for line in p["discussion"].split('\n') if line.strip()],
+            ])
+        append_run_rows(disc_table, rows, size_half_pts=22)
+        
+        doc.add_paragraph()
+    else:
+         doc.add_paragraph("No specific discussion points recorded.")
+
+    doc.add_paragraph("\n\n")
+    
+    # --- SIGNATURES ---
+    sig_table = doc.add_table(rows=1, cols=2)
+    sig_table.autofit = False
+    sig_table.columns[0].width = Inches(3.25)
+    sig_table.columns[1].width = Inches(3.25)
+    p1 = sig_table.rows[0].cells[0].paragraphs[0]
+    r1 = p1.add_run("CONVENER")
+    r1.bold = True
+    p1.alignment = WD_ALIGN_PARAGRAPH.LEFT
+    p2 = sig_table.rows[0].cells[1].paragraphs[0]
+    r2 = p2.add_run("PRINCIPAL")
+    r2.bold = True
+    p2.alignment = WD_ALIGN_PARAGRAPH.RIGHT
+    tbl = sig_table._element
+    tblPr = tbl.tblPr
+    if tblPr is None:
+         tblPr = parse_xml(r'<w:tblPr xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:tblBorders><w:top w:val="none" w:sz="0" w:space="0" w:color="auto"/><w:left w:val="none" w:sz="0" w:space="0" w:color="auto"/><w:bottom w:val="none" w:sz="0" w:space="0" w:color="auto"/><w:right w:val="none" w:sz="0" w:space="0" w:color="auto"/><w:insideH w:val="none" w:sz="0" w:space="0" w:color="auto"/><w:insideV w:val="none" w:sz="0" w:space="0" w:color="auto"/></w:tblBorders></w:tblPr>')
+
+    buf = io.BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+
+# --- PDF (FPDF) ---
+def build_pdf(meeting):
+    """Renders the minutes as PDF bytes."""
+    pdf = ReportPDF()
+    # Unicode TrueType fonts, so bullets and non-Latin names render
+    font = report_assets.add_pdf_fonts(pdf)
+    bullet = "•" if font != "Arial" else "-"
+    pdf.add_page()
+    
+    # Header
+    
+    # Swapped: Brand Logo (Left), SM Logo (Right)
+    logo2 = report_assets.logo(report_assets.BRAND_LOGO_PATH)
+    logo1 = report_assets.logo(report_assets.SM_LOGO_PATH)
+    if logo2 is not None: # College Logo Left
+        logo2.add_to_pdf(pdf, 10, 10, 30) # x, y, w
+    
+    pdf.set_y(15)
+    pdf.set_font(font, 'B', 16)
+    pdf.cell(0, 10, "SERVICE MOTTO VOLUNTEERS", 0, 1, 'C')
+    pdf.set_font(font, 'B', 14)
+    pdf.cell(0, 10, "MINUTES OF MEET", 0, 1, 'C')
+    
+    if logo1 is not None: # SM Logo Right
+        logo1.add_to_pdf(pdf, 170, 10, 30)
+    
+    pdf.ln(20)
+    
+    # Details
+    pdf.set_font(font, 'B', 12)
+    pdf.cell(95, 10, f"DATE: {meeting['date'].strftime('%d-%m-%Y')}", 0, 0, 'L')
+    pdf.cell(95, 10, f"TIME: {meeting['time']}", 0, 1, 'R')
+    
+    pdf.ln(5)
+    
+    # Attendance Table: rows are streamed from the student list and the
+    # S.NO/NAME/YEAR/DEPARTMENT header is repeated on every page.
+    with PdfTable(pdf, [20, 90, 30, 50], header=["S.NO", "NAME", "YEAR", "DEPARTMENT"], font=(font, "", 11), header_font=(font, "B", 11)) as table:
+        table.rows(
+            ((str(i), str(s["NAME"]), str(s.get("YEAR", "")), str(s.get("DEPARTMENT", "")))
+             for i, s in enumerate(meeting["students"], start=1)),
+            aligns=('C', 'L', 'C', 'C'),
+        )
+    
+    pdf.ln(10)
+    
+    # Discussion
+    if meeting["points"]:
+        pdf.set_font(font, 'B', 12)
+        pdf.cell(0, 10, "Discussed in Today's SM Room Meeting:", 0, 1, 'L')
+        pdf.ln(5)
+        
+        with PdfTable(pdf, [40, 150], font=(font, "", 11), header_font=(font, "B", 11)) as table:
+            for i, p in enumerate(meeting["points"], 1):
+                # Keep the point and the start of its discussion together
+                table.ensure_room(10 + 10)
+                table.label_row(f"Point : {i}", p['topic'])
+                
+                # Discussion content with bullet points
+                discussion_lines = p["discussion"].split('\n')
+                discussion_text = '\n'.join([f"{bullet} {line.strip()}" for line in discussion_lines if line.strip()])
+                table.label_row("Discussion", discussion_text)
+                
+                pdf.ln(2)
+    
+    
+    pdf.ln(20)
+    
+    # Signatures
+    pdf.set_font(font, 'B', 12)
+    if pdf.get_y() + 10 > pdf.page_break_trigger:
+        pdf.add_page()
+    pdf.cell(95, 10, "CONVENER", 0, 0, 'L')
+    pdf.cell(95, 10, "PRINCIPAL", 0, 1, 'R')
+    
+    # FPDF 1.7 returns the document as a latin-1 str with dest="S"
+    return pdf.output(dest="S").encode("latin-1")
@@ -0,0 +1,70 @@
+"""LRU, size-bounded cache of rendered report bytes keyed on a canonical meeting hash."""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+MAX_ENTRIES = int(os.environ.get("MOM_REPORT_CACHE_ENTRIES", "64"))
+MAX_BYTES = int(os.environ.get("MOM_REPORT_CACHE_MB", "256")) * 1024 * 1024
+
+
+def meeting_key(meeting, asset_versions):
+    """Stable hash of everything that affects the rendered output."""
+    canonical = {
+        "date": str(meeting["date"]),
+        "time": meeting["time"],
+        "years": sorted(str(y) for y in meeting.get("years", [])),
+        "departments": sorted(meeting.get("departments", [])),
+        "points": meeting["points"],
+        "students": meeting["students"],
+        "assets": asset_versions,
+    }
+    blob = json.dumps(canonical, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class ReportCache:
+    def __init__(self, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._items = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _size(outputs):
+        return sum(len(v) for v in outputs.values())
+
+    def get(self, key):
+        with self._lock:
+            outputs = self._items.get(key)
+            if outputs is not None:
+                self._items.move_to_end(key)
+            return outputs
+
+    def put(self, key, outputs):
+        size = self._size(outputs)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._bytes -= self._size(old)
+            self._items[key] = outputs
+            self._bytes += size
+            while self._items and (len(self._items) > self.max_entries or self._bytes > self.max_bytes):
+                _, evicted = self._items.popitem(last=False)
+                self._bytes -= self._size(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._items), "bytes": self._bytes}
+
+
+cache = ReportCache()
@@ -0,0 +1,86 @@
+"""Meeting assembly and report rendering without Streamlit.
+
+The app and ``generate_reports.py`` both go through here, so a draft rendered
+from the command line comes out identical to one generated in the UI. The
+renderers (python-docx, fpdf) are only imported when a report is first built.
+"""
+import os
+from datetime import date
+
+import numpy as np
+
+import report_archive
+from attendance import AttendanceSet
+
+KINDS = ("docx", "pdf")
+MIME_TYPES = {
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "pdf": "application/pdf",
+}
+REPORT_COLUMNS = ("NAME", "YEAR", "DEPARTMENT")
+
+
+def file_name(meeting, kind):
+    """Download name for a rendered report, e.g. SM_MOM_2026-02-17.pdf."""
+    return f"SM_MOM_{meeting['date']}.{kind}"
+
+
+def _as_list(value):
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def present_rows(snapshot, years, depts, att):
+    """Present row ids in report order: by year, then NAME, as the attendance grid lists them."""
+    parts = [rows[att.mask(rows)] for rows in snapshot.index.rows_by_year(years, depts).values()]
+    return np.concatenate(parts) if parts else np.empty(0, dtype=np.int32)
+
+
+def build_meeting(snapshot, rows, meeting_date, meeting_time, years, depts, points):
+    """The plain meeting dict the renderers take (see report_builder)."""
+    df = snapshot.df
+    cols = [c for c in REPORT_COLUMNS if c in df.columns]
+    return {
+        "date": meeting_date,
+        "time": meeting_time,
+        "years": list(years),
+        "departments": list(depts),
+        "students": df[cols].iloc[rows].to_dict("records"),
+        "points": list(points),
+    }
+
+
+def meeting_from_draft(draft, snapshot):
+    """Resolves a stored draft against the roster; names no longer on it are dropped."""
+    years = [int(y) for y in _as_list(draft.get("year"))]
+    depts = _as_list(draft.get("department"))
+    att = AttendanceSet.from_names(snapshot, draft.get("attendance", []))
+    rows = present_rows(snapshot, years, depts, att)
+    return build_meeting(
+        snapshot, rows, date.fromisoformat(draft["date"]), draft.get("time", ""),
+        years, depts, draft.get("points", []),
+    )
+
+
+def render(kind, meeting):
+    """Renders one output in memory and archives it if enabled."""
+    import report_builder
+
+    data = getattr(report_builder, f"build_{kind}")(meeting)
+    report_archive.store(data, kind)
+    return data
+
+
+def render_to_files(meeting, kinds, out_dir, stem=None):
+    """Worker entry point for batch runs: writes each kind to ``out_dir`` and returns the paths."""
+    paths = []
+    for kind in kinds:
+        name = f"{stem}.{kind}" if stem else file_name(meeting, kind)
+        path = os.path.join(out_dir, name)
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(render(kind, meeting))
+        os.replace(tmp, path)
+        paths.append(path)
+    return paths
@@ -0,0 +1,145 @@
+"""Background report generation: a process-wide job queue over a worker pool."""
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import BrokenExecutor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+import report_assets
+import report_engine
+from report_cache import cache, meeting_key
+
+# "process" renders off the GIL so concurrent users don't serialise on CPU;
+# "thread" is handy where spawning processes is not allowed.
+EXECUTOR_KIND = os.environ.get("MOM_REPORT_EXECUTOR", "process")
+MAX_WORKERS = int(os.environ.get("MOM_REPORT_WORKERS", "0")) or min(4, os.cpu_count() or 1)
+JOB_TTL_SECONDS = 3600
+
+
+_lock = threading.Lock()
+_executor = None
+_jobs = {}
+
+
+class ReportJob:
+    def __init__(self, futures, cache_key=None, cached=False, owner=None):
+        self.id = uuid.uuid4().hex
+        self.owner = owner
+        self.futures = futures
+        self.cache_key = cache_key
+        self.cached = cached
+        self.from_cache = cached
+        self.created = time.time()
+        self.t0 = time.perf_counter()
+        self.seconds = {}  # kind -> wall time from submit to finished
+        for f in futures.values():
+            f.add_done_callback(self._on_done)
+
+    def _on_done(self, future):
+        for kind, f in self.futures.items():
+            if f is future:
+                self.seconds[kind] = time.perf_counter() - self.t0
+        if self.cached or not all(f.done() for f in self.futures.values()):
+            return
+        if any(f.exception() is not None for f in self.futures.values()):
+            return
+        self.cached = True
+        cache.put(self.cache_key, {kind: f.result() for kind, f in self.futures.items()})
+
+
+def _finished(result):
+    f = Future()
+    f.set_result(result)
+    return f
+
+
+def _failed(error):
+    f = Future()
+    f.set_exception(error)
+    return f
+
+
+def _get_executor():
+    global _executor
+    with _lock:
+        if _executor is None:
+            if EXECUTOR_KIND == "thread":
+                _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="report")
+            else:
+                _executor = ProcessPoolExecutor(max_workers=MAX_WORKERS)
+        return _executor
+
+
+def _drop_executor(broken):
+    """Forgets a pool whose workers died (e.g. OOM-killed), so the next job starts a fresh one."""
+    global _executor
+    with _lock:
+        if _executor is broken:
+            _executor = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def _submit_renders(meeting):
+    """{kind: future} for every renderer, retrying once on a fresh pool if the current one is broken."""
+    error = None
+    for _ in range(2):
+        executor = _get_executor()
+        try:
+            return {kind: executor.submit(report_engine.render, kind, meeting) for kind in report_engine.KINDS}
+        except BrokenExecutor as e:
+            _drop_executor(executor)
+            error = e
+    # Surfaced as an "error" job rather than raised into the page.
+    return {kind: _failed(error) for kind in report_engine.KINDS}
+
+
+def _prune():
+    cutoff = time.time() - JOB_TTL_SECONDS
+    with _lock:
+        for job_id in [j for j, job in _jobs.items() if job.created < cutoff]:
+            del _jobs[job_id]
+
+
+def submit(meeting, owner=None):
+    """Queues the DOCX and PDF renderers for ``meeting`` in parallel and returns a job id.
+
+    An unchanged meeting is served from the report cache as an already-finished job.
+    ``owner`` (the session id) scopes the job so other sessions can't read it.
+    """
+    _prune()
+    key = meeting_key(meeting, report_assets.versions())
+    outputs = cache.get(key)
+    if outputs is not None:
+        job = ReportJob({kind: _finished(data) for kind, data in outputs.items()}, key, cached=True, owner=owner)
+    else:
+        job = ReportJob(_submit_renders(meeting), key, owner=owner)
+    with _lock:
+        _jobs[job.id] = job
+    return job.id
+
+
+def status(job_id, owner=None):
+    """Snapshot of a job's progress.
+
+    ``state`` is one of "running", "done", "error" or "missing"; ``outputs`` maps
+    each renderer to its bytes once every renderer has finished, and ``seconds``
+    to how long it took from submission.
+    """
+    with _lock:
+        job = _jobs.get(job_id)
+    if job is None or job.owner != owner:
+        return {"state": "missing", "done": 0, "total": len(report_engine.KINDS), "outputs": {}, "error": None, "seconds": {}, "cached": False}
+    done = [f for f in job.futures.values() if f.done()]
+    info = {
+        "state": "running", "done": len(done), "total": len(job.futures), "outputs": {}, "error": None,
+        "seconds": dict(job.seconds), "cached": job.from_cache,
+    }
+    for f in done:
+        if f.exception() is not None:
+            info["state"] = "error"
+            info["error"] = f.exception()
+            return info
+    if len(done) == len(job.futures):
+        info["state"] = "done"
+        info["outputs"] = {kind: f.result() for kind, f in job.futures.items()}
+    return info
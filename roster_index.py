@@ -0,0 +1,55 @@
+"""Name-sorted (YEAR, DEPARTMENT) row-id index over a roster snapshot."""
+import numpy as np
+
+
+def _py(value):
+    return value.item() if hasattr(value, "item") else value
+
+
+def _frozen(array):
+    # Shared by every session in the process; nothing may write to it.
+    array.flags.writeable = False
+    return array
+
+
+class RosterIndex:
+    """Built once per roster version; every filter is then a merge of presorted slices.
+
+    Rows are identified by their position in the snapshot frame. Each group keeps
+    the *name ranks* of its rows in ascending order, so merging groups is a sort
+    of already-sorted runs and mapping back through ``order`` yields row ids in
+    NAME order.
+    """
+
+    def __init__(self, df):
+        n = len(df)
+        names = df["NAME"].astype(str).to_numpy(dtype=object) if "NAME" in df.columns else np.array([""] * n, dtype=object)
+        self.names = _frozen(names)
+        self.row_of = {name: i for i, name in enumerate(names)}
+        self.order = _frozen(np.argsort(names, kind="stable").astype(np.int32))
+        rank = np.empty(n, dtype=np.int32)
+        rank[self.order] = np.arange(n, dtype=np.int32)
+        self.rank = _frozen(rank)
+
+        self.groups = {}
+        if "YEAR" in df.columns and "DEPARTMENT" in df.columns:
+            for key, positions in df.groupby(["YEAR", "DEPARTMENT"], sort=False, observed=True).indices.items():
+                year, dept = _py(key[0]), _py(key[1])
+                self.groups[(year, dept)] = _frozen(np.sort(self.rank[positions]))
+        self.years = sorted({y for y, _ in self.groups})
+        self.departments = sorted({d for _, d in self.groups})
+
+    def _merge(self, keys):
+        runs = [self.groups[k] for k in keys if k in self.groups]
+        if not runs:
+            return np.empty(0, dtype=np.int32)
+        ranks = runs[0] if len(runs) == 1 else np.sort(np.concatenate(runs), kind="stable")
+        return self.order[ranks]
+
+    def rows(self, years, depts):
+        """Row ids for any of ``years`` x ``depts``, sorted by NAME."""
+        return self._merge([(y, d) for y in years for d in depts])
+
+    def rows_by_year(self, years, depts):
+        """{year: row ids sorted by NAME} for each selected year, in year order."""
+        return {y: self._merge([(y, d) for d in depts]) for y in sorted(years)}
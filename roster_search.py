@@ -0,0 +1,83 @@
+"""Case-insensitive search over NAME and REGISTER NO, built once per roster snapshot.
+
+Queries of three or more characters are substring matches: the postings of
+every trigram in the query are intersected, then the few surviving rows are
+checked against the full text. Shorter queries match the start of any word
+(or of the register number) through a sorted token list. Results are row ids
+in NAME order, like everything else built on RosterIndex.
+"""
+import re
+from bisect import bisect_left
+
+import numpy as np
+
+GRAM = 3
+_EMPTY = np.empty(0, dtype=np.int32)
+_WORD_SPLIT = re.compile(r"[\s.\x00]+")
+
+
+def _text(value):
+    if value is None or value != value:  # None / NaN
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        # Register numbers come back from Excel as floats.
+        return str(int(value))
+    return str(value).casefold()
+
+
+class SearchIndex:
+    def __init__(self, df, rank):
+        n = len(df)
+        names = df["NAME"].tolist() if "NAME" in df.columns else [""] * n
+        regs = df["REGISTER NO"].tolist() if "REGISTER NO" in df.columns else [""] * n
+        # NUL never appears in a query, so no trigram spans the two fields.
+        self.keys = [f"{_text(name)}\x00{_text(reg)}" for name, reg in zip(names, regs)]
+        self.rank = rank
+        self.size = n
+
+        postings = {}
+        tokens = []
+        for row, key in enumerate(self.keys):
+            for gram in {key[i:i + GRAM] for i in range(len(key) - GRAM + 1)}:
+                postings.setdefault(gram, []).append(row)
+            tokens.extend((tok, row) for tok in set(_WORD_SPLIT.split(key)) if tok)
+        # Rows were appended in ascending order, so every posting list is sorted.
+        self.postings = {gram: np.array(rows, dtype=np.int32) for gram, rows in postings.items()}
+        tokens.sort()
+        self.tokens = [tok for tok, _ in tokens]
+        self.token_rows = np.array([row for _, row in tokens], dtype=np.int32)
+
+    def _by_name(self, rows):
+        return rows[np.argsort(self.rank[rows], kind="stable")]
+
+    def find(self, query):
+        """Row ids matching ``query``, in NAME order."""
+        q = _text(query).strip()
+        if not q:
+            return _EMPTY
+        if len(q) < GRAM:
+            lo = bisect_left(self.tokens, q)
+            hi = bisect_left(self.tokens, q + "\uffff")
+            return self._by_name(np.unique(self.token_rows[lo:hi]))
+
+        lists = []
+        for gram in {q[i:i + GRAM] for i in range(len(q) - GRAM + 1)}:
+            rows = self.postings.get(gram)
+            if rows is None:
+                return _EMPTY
+            lists.append(rows)
+        lists.sort(key=len)
+        candidates = lists[0]
+        for rows in lists[1:]:
+            if not len(candidates):
+                return _EMPTY
+            candidates = np.intersect1d(candidates, rows, assume_unique=True)
+        keys = self.keys
+        hits = np.array([r for r in candidates.tolist() if q in keys[r]], dtype=np.int32)
+        return self._by_name(hits)
+
+    def mask(self, query):
+        """Boolean mask over the roster rows matching ``query``."""
+        m = np.zeros(self.size, dtype=bool)
+        m[self.find(query)] = True
+        return m
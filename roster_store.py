@@ -0,0 +1,206 @@
+"""Columnar roster snapshots built from students.xlsx."""
+import hashlib
+import json
+import os
+import threading
+from functools import cached_property
+
+import pandas as pd
+
+ROSTER_PATH = os.environ.get("MOM_ROSTER", "students.xlsx")
+CACHE_DIR = ".roster_cache"
+
+
+class RosterSnapshot:
+    """An immutable, normalised view of the roster for one version of the sheet."""
+
+    def __init__(self, df, version):
+        self.df = df
+        self.version = version
+
+    def __len__(self):
+        return len(self.df)
+
+    @cached_property
+    def index(self):
+        from roster_index import RosterIndex
+        return RosterIndex(self.df)
+
+    @cached_property
+    def search(self):
+        from roster_search import SearchIndex
+        return SearchIndex(self.df, self.index.rank)
+
+
+# --- BUILD ---
+def _file_hash(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _as_text(value):
+    if pd.isna(value):
+        return None
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).strip()
+
+
+def build_frame(xlsx_path):
+    """Parses the sheet and applies the one-off clean-up done for every roster."""
+    df = pd.read_excel(xlsx_path)
+    if "DEPARTMENT" in df.columns:
+        df["DEPARTMENT"] = df["DEPARTMENT"].replace("AIDS", "AI&DS")
+    if "NAME" in df.columns:
+        df = df.drop_duplicates(subset=["NAME"], keep="first")
+    # Excel hands back mixed int/str columns (e.g. phone numbers) that Arrow can't store.
+    for col in df.columns:
+        if df[col].dtype == object:
+            df[col] = df[col].map(_as_text)
+    return df.reset_index(drop=True)
+
+
+def _shared(df):
+    """Compacts the one frame every session reads: DEPARTMENT as a categorical, YEAR as int8.
+
+    pandas' copy-on-write already hands sessions read-only views of it.
+    """
+    if "DEPARTMENT" in df.columns and df["DEPARTMENT"].dtype != "category":
+        df["DEPARTMENT"] = df["DEPARTMENT"].astype("category")
+    if "YEAR" in df.columns and pd.api.types.is_integer_dtype(df["YEAR"]):
+        df["YEAR"] = pd.to_numeric(df["YEAR"], downcast="integer")
+    return df
+
+
+def _snapshot_paths(xlsx_path):
+    stem = os.path.splitext(os.path.basename(xlsx_path))[0]
+    base = os.path.join(CACHE_DIR, stem)
+    return base + ".parquet", base + ".meta.json"
+
+
+def _stat_key(xlsx_path):
+    st_ = os.stat(xlsx_path)
+    return [st_.st_mtime_ns, st_.st_size]
+
+
+def _write_snapshot(xlsx_path, df, version, stat_key):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    parquet_path, meta_path = _snapshot_paths(xlsx_path)
+    tmp = f"{parquet_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    df.to_parquet(tmp, index=False)
+    os.replace(tmp, parquet_path)
+    tmp = f"{meta_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump({"sha256": version, "stat": stat_key}, f)
+    os.replace(tmp, meta_path)
+
+
+def _read_meta(xlsx_path):
+    _, meta_path = _snapshot_paths(xlsx_path)
+    try:
+        with open(meta_path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _read_snapshot(xlsx_path, version):
+    parquet_path, _ = _snapshot_paths(xlsx_path)
+    return RosterSnapshot(_shared(pd.read_parquet(parquet_path)), version)
+
+
+def rebuild(xlsx_path=ROSTER_PATH, stat_key=None):
+    """Parses the sheet and writes a fresh snapshot, returning it.
+
+    ``stat_key`` must be taken before the file is read, so an edit made while
+    rebuilding is seen as a change next time.
+    """
+    if stat_key is None:
+        stat_key = _stat_key(xlsx_path)
+    version = _file_hash(xlsx_path)
+    df = _shared(build_frame(xlsx_path))
+    _write_snapshot(xlsx_path, df, version, stat_key)
+    return RosterSnapshot(df, version)
+
+
+# --- PROCESS-WIDE STORE ---
+_lock = threading.Lock()
+_current = {}      # xlsx path -> RosterSnapshot
+_stat_seen = {}    # xlsx path -> stat key the current snapshot was validated against
+_rebuilding = set()
+
+
+def _rebuild_in_background(xlsx_path):
+    def work():
+        stat_key = _stat_key(xlsx_path)
+        try:
+            snap = rebuild(xlsx_path, stat_key)
+        except Exception:
+            # Keep serving the last good snapshot. The failed stat is recorded so a
+            # half-saved or corrupt sheet is retried on its next change, not on
+            # every rerun.
+            with _lock:
+                _stat_seen[xlsx_path] = stat_key
+        else:
+            with _lock:
+                _current[xlsx_path] = snap
+                _stat_seen[xlsx_path] = stat_key
+        finally:
+            with _lock:
+                _rebuilding.discard(xlsx_path)
+
+    with _lock:
+        if xlsx_path in _rebuilding:
+            return
+        _rebuilding.add(xlsx_path)
+    threading.Thread(target=work, name="roster-rebuild", daemon=True).start()
+
+
+def _load_cold(xlsx_path, stat_key):
+    """First load in this process: reuse the on-disk snapshot when it still matches."""
+    meta = _read_meta(xlsx_path)
+    if meta:
+        if meta.get("stat") == stat_key:
+            try:
+                return _read_snapshot(xlsx_path, meta["sha256"])
+            except Exception:
+                pass
+        else:
+            version = _file_hash(xlsx_path)
+            if version == meta.get("sha256"):
+                try:
+                    snap = _read_snapshot(xlsx_path, version)
+                    _write_snapshot(xlsx_path, snap.df, version, stat_key)
+                    return snap
+                except Exception:
+                    pass
+    return rebuild(xlsx_path, stat_key)
+
+
+def get_roster(xlsx_path=ROSTER_PATH):
+    """Returns the current roster snapshot.
+
+    Costs one stat() when the sheet is unchanged. When it changes, the previous
+    snapshot keeps being served while a new one is built in the background.
+    """
+    stat_key = _stat_key(xlsx_path)
+    with _lock:
+        snap = _current.get(xlsx_path)
+        seen = _stat_seen.get(xlsx_path)
+    if snap is None:
+        snap = _load_cold(xlsx_path, stat_key)
+        with _lock:
+            _current[xlsx_path] = snap
+            _stat_seen[xlsx_path] = stat_key
+        return snap
+    if seen != stat_key:
+        if _file_hash(xlsx_path) == snap.version:
+            # Touched but not edited (e.g. re-saved or copied).
+            with _lock:
+                _stat_seen[xlsx_path] = stat_key
+        else:
+            _rebuild_in_background(xlsx_path)
+    return snap
@@ -0,0 +1,13 @@
+"""Small Streamlit helpers shared by the page and its sections."""
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+
+def rerun_fragment():
+    """Reruns the calling fragment, or the whole page if this run is a full one.
+
+    Streamlit refuses a fragment-scoped rerun during a full run (e.g. when a
+    fragment's widget event was folded into a pending full rerun).
+    """
+    ctx = get_script_run_ctx()
+    st.rerun(scope="fragment" if ctx is not None and ctx.fragment_ids_this_run else "app")